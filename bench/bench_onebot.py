@@ -0,0 +1,153 @@
+"""
+协议端交互基准：用 FakeOneBot 替代 cfg.client，测量端到端耗时
+
+用例：
+- generate_post：随机选群 → 分页拉取群聊历史 → 拼装上下文 → 调用（假的）LLM
+- msg_contexts：只测 _get_msg_contexts 的分页拉取与上下文拼装
+- admin_fanout：Sender 向全部管理员逐个私聊推送
+- login：QzoneSession 并发 get_ctx 时只触发一次 get_cookies
+
+用法（在插件根目录执行）：
+    python bench/bench_onebot.py --latency 0.02 --history 5000
+    python bench/bench_onebot.py -o onebot.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from astrbot.api import logger  # noqa: E402
+from astrbot.core.provider.provider import Provider  # noqa: E402
+from fake_onebot import FakeOneBot  # noqa: E402
+
+from core.llm_action import LLMAction  # noqa: E402
+from core.qzone.session import QzoneSession  # noqa: E402
+from core.sender import Sender  # noqa: E402
+
+
+class FakeProvider(Provider):
+    """固定回复的 LLM 提供商，只模拟往返耗时"""
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__({"id": "fake"}, {})
+        self.latency = latency
+        self.last_contexts: list[dict] = []
+
+    async def text_chat(self, *, system_prompt: str = "", contexts=None, **_: Any):
+        self.last_contexts = contexts or []
+        await asyncio.sleep(self.latency)
+        return SimpleNamespace(completion_text='"""今天的群聊很热闹"""')
+
+    async def get_models(self) -> list[str]:
+        return ["fake"]
+
+    def get_current_key(self) -> str:
+        return ""
+
+    def set_key(self, key: str) -> None:
+        pass
+
+
+def make_cfg(bot: FakeOneBot, provider: Provider, args: argparse.Namespace) -> Any:
+    """LLMAction / Sender / QzoneSession 用到的最小配置子集"""
+    return SimpleNamespace(
+        client=bot,
+        context=SimpleNamespace(get_provider_by_id=lambda _id: provider),
+        llm=SimpleNamespace(post_provider_id="fake", post_prompt="写一条说说"),
+        source=SimpleNamespace(post_max_msg=args.max_msg, ignore_groups=[]),
+        admins_id=[str(40000 + i) for i in range(args.admins)],
+        manage_group="",
+        cookie_ttl=3600,
+    )
+
+
+async def run_case(name: str, bot: FakeOneBot, rounds: int, fn) -> dict[str, Any]:
+    bot.calls.clear()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await fn()
+    elapsed = (time.perf_counter() - start) / rounds
+    result = {
+        "ms_per_op": round(elapsed * 1000, 2),
+        "ops_per_sec": round(1 / elapsed, 1) if elapsed else None,
+        "calls_per_op": {k: v / rounds for k, v in sorted(bot.calls.items())},
+    }
+    print(f"{name:<16} {result['ms_per_op']:>10.2f} ms  {result['calls_per_op']}")
+    return result
+
+
+async def main_async(args: argparse.Namespace) -> dict[str, Any]:
+    bot = FakeOneBot(
+        history_size=args.history, latency=args.latency, jitter=args.jitter
+    )
+    provider = FakeProvider(args.llm_latency)
+    cfg = make_cfg(bot, provider, args)
+    llm = LLMAction(cfg)  # type: ignore[arg-type]
+    # Sender 的渲染器与本基准无关，跳过 __init__ 只挂配置
+    sender = Sender.__new__(Sender)
+    sender.cfg = cfg  # type: ignore[assignment]
+    obmsg = [{"type": "text", "data": {"text": "有新的投稿待审核"}}]
+
+    async def login():
+        session = QzoneSession(cfg)  # type: ignore[arg-type]
+        await asyncio.gather(*(session.get_ctx() for _ in range(args.concurrency)))
+
+    results = {
+        "generate_post": await run_case(
+            "generate_post", bot, args.rounds, lambda: llm.generate_post()
+        ),
+        "msg_contexts": await run_case(
+            "msg_contexts",
+            bot,
+            args.rounds,
+            lambda: llm._get_msg_contexts(str(bot.group_ids[0])),
+        ),
+        "admin_fanout": await run_case(
+            "admin_fanout",
+            bot,
+            args.rounds,
+            lambda: sender._send_to_admins(bot, obmsg),  # type: ignore[arg-type]
+        ),
+        "login": await run_case("login", bot, args.rounds, login),
+    }
+    return {
+        "meta": {k: v for k, v in vars(args).items() if k != "output"},
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="FakeOneBot 交互基准")
+    parser.add_argument(
+        "--latency", type=float, default=0.01, help="单次调用延迟（秒）"
+    )
+    parser.add_argument("--jitter", type=float, default=0.0, help="延迟抖动上限（秒）")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="LLM 延迟（秒）")
+    parser.add_argument("--history", type=int, default=2000, help="每个群的历史消息数")
+    parser.add_argument("--max-msg", type=int, default=500, help="post_max_msg")
+    parser.add_argument("--admins", type=int, default=5, help="管理员数量")
+    parser.add_argument("--concurrency", type=int, default=20, help="并发 get_ctx 数")
+    parser.add_argument("--rounds", type=int, default=5, help="每个用例的重复次数")
+    parser.add_argument("-o", "--output", type=Path, help="结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    logger.setLevel(logging.WARNING)
+    report = asyncio.run(main_async(args))
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+解析器基准：回放 bench/fixtures 下录制（已脱敏）的接口响应
+
+用法（在插件根目录执行）：
+    python bench/bench_parser.py                       # 打印结果
+    python bench/bench_parser.py -o before.json        # 保存结果
+    python bench/bench_parser.py --compare before.json # 与之前的结果对比
+
+每个用例报告吞吐（ops/s、单次耗时）与单次调用的内存分配（tracemalloc 统计的
+调用结束后仍存活的分配块数与峰值内存），结果为 JSON，便于在不同提交之间比较。
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+sys.path.insert(0, str(ROOT))
+
+from astrbot.api import logger  # noqa: E402
+
+from core.qzone.parser import QzoneParser  # noqa: E402
+
+
+def load(name: str) -> str:
+    return (FIXTURES / f"{name}.txt").read_text(encoding="utf-8")
+
+
+def build_cases() -> dict[str, Callable[[], Any]]:
+    """用例名 → 无参可调用对象；解析 JSON 的输入预先解码，只测目标函数本身"""
+    raw = {name: load(name) for name in ("msglist", "msgdetail", "feeds3", "visitor")}
+    data = {name: QzoneParser.parse_response(text) for name, text in raw.items()}
+    cases: dict[str, Callable[[], Any]] = {
+        f"parse_response[{name}]": (lambda t=text: QzoneParser.parse_response(t))
+        for name, text in raw.items()
+    }
+    cases["parse_feeds[msglist]"] = lambda: QzoneParser.parse_feeds(
+        data["msglist"]["msglist"]
+    )
+    cases["parse_feeds[msgdetail]"] = lambda: QzoneParser.parse_feeds(
+        [data["msgdetail"]]
+    )
+    cases["parse_recent_feeds[feeds3]"] = lambda: QzoneParser.parse_recent_feeds(
+        data["feeds3"]
+    )
+    cases["parse_visitors[visitor]"] = lambda: QzoneParser.parse_visitors(
+        data["visitor"]
+    )
+    return cases
+
+
+def timed(fn: Callable[[], Any], number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return time.perf_counter() - start
+
+
+def measure(fn: Callable[[], Any], min_time: float) -> dict[str, float]:
+    # 预热，并确定每轮调用次数
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= 0.05:
+            break
+        number *= 2
+
+    # 取多轮里最快的一轮，降低调度抖动
+    rounds = max(int(min_time / elapsed), 3)
+    best = min(timed(fn, number) for _ in range(rounds)) / number
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    return {
+        "ops_per_sec": round(1 / best, 1),
+        "us_per_op": round(best * 1e6, 2),
+        "retained_blocks": sum(max(s.count_diff, 0) for s in stats),
+        "alloc_peak_kib": round(peak / 1024, 1),
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except Exception:
+        return ""
+
+
+def compare(current: dict, baseline: dict) -> None:
+    print(f"\n对比 {baseline['meta'].get('revision') or '基线'}：")
+    for name, now in current["results"].items():
+        old = baseline["results"].get(name)
+        if not old:
+            print(f"  {name:<34} 新增")
+            continue
+        speed = (old["us_per_op"] / now["us_per_op"] - 1) * 100
+        alloc = now["alloc_peak_kib"] - old["alloc_peak_kib"]
+        print(f"  {name:<34} 速度 {speed:+6.1f}%   峰值内存 {alloc:+8.1f} KiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="QzoneParser 基准")
+    parser.add_argument("-o", "--output", type=Path, help="结果写入 JSON 文件")
+    parser.add_argument("--compare", type=Path, help="与之前保存的结果对比")
+    parser.add_argument(
+        "--min-time", type=float, default=1.0, help="每个用例的计时秒数"
+    )
+    parser.add_argument(
+        "-k", "--filter", default="", help="只运行名称包含该字符串的用例"
+    )
+    args = parser.parse_args()
+
+    # parse_recent_feeds 每次都会打 info 日志，基准时关掉
+    logger.setLevel(logging.WARNING)
+
+    results = {}
+    for name, fn in build_cases().items():
+        if args.filter not in name:
+            continue
+        results[name] = measure(fn, args.min_time)
+        r = results[name]
+        print(
+            f"{name:<34} {r['ops_per_sec']:>10.1f} ops/s {r['us_per_op']:>10.2f} us"
+            f" {r['retained_blocks']:>8} blocks {r['alloc_peak_kib']:>8.1f} KiB"
+        )
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": int(time.time()),
+        },
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    if args.compare:
+        compare(report, json.loads(args.compare.read_text(encoding="utf-8")))
+
+
+if __name__ == "__main__":
+    main()
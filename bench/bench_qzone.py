@@ -0,0 +1,250 @@
+"""
+QQ 空间接口基准：QzoneAPI(base_url=...) 打到本地 FakeQzone，走真实的
+限流 / 重试 / 熔断 / 重登路径（登录由 FakeOneBot 提供 Cookie）
+
+用例：
+- read_burst：并发拉取说说详情，服务端按接口限流；分别关闭 / 开启客户端限流，
+  对比 429 次数、重试与熔断拒绝
+- retry：详情接口连续两次 500，幂等 GET 退避重试后成功
+- breaker：访客接口持续 500，连续失败达到阈值后熔断，后续请求不再发出
+- relogin：说说列表返回 -3000，触发重登（再次 get_cookies）后成功
+- faults：动态流返回 403 / 空响应体时的错误码
+- publish：发一条 9 张图的说说（下载 → 压缩 → 上传 → 发布），
+  再点赞 / 评论 / 回复 / 删除，观察上传接口的单独限速
+
+用法（在插件根目录执行）：
+    python bench/bench_qzone.py --latency 0.02 --server-rate 4
+    python bench/bench_qzone.py -o qzone.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from astrbot.api import logger  # noqa: E402
+from fake_onebot import FakeOneBot  # noqa: E402
+from fake_qzone import FakeQzone  # noqa: E402
+
+from core.http_session import HttpSessionRegistry  # noqa: E402
+from core.model import Comment, Post  # noqa: E402
+from core.qzone.api import QzoneAPI  # noqa: E402
+from core.qzone.retry import CircuitOpenError  # noqa: E402
+from core.qzone.session import QzoneSession  # noqa: E402
+
+DETAIL = "emotion_cgi_msgdetail_v6"
+VISITOR = "cgi_get_visitor_more"
+
+
+def make_cfg(
+    bot: FakeOneBot, http: HttpSessionRegistry, data_dir: Path, args, *, throttle: bool
+) -> Any:
+    """QzoneAPI / QzoneSession 用到的最小配置子集"""
+    return SimpleNamespace(
+        client=bot,
+        cookie_ttl=3600,
+        timeout=10,
+        http=http,
+        data_dir=data_dir,
+        throttle=SimpleNamespace(
+            enabled=throttle,
+            read_rate=args.read_rate,
+            write_rate=1.0,
+            burst=int(args.read_rate),
+            max_inflight=4,
+            upload_rate=args.upload_rate,
+            upload_burst=9,
+            upload_inflight=4,
+        ),
+        image=SimpleNamespace(compress=True, max_side=2048, quality=85, min_kb=512),
+    )
+
+
+class Bench:
+    def __init__(self, args: argparse.Namespace, server: FakeQzone, data_dir: Path):
+        self.args = args
+        self.server = server
+        self.data_dir = data_dir
+        self.bot = FakeOneBot()
+        self.http = HttpSessionRegistry()
+
+    def api(self, *, throttle: bool = True) -> QzoneAPI:
+        """每个用例一个新实例：缓存、限流与熔断状态互不影响"""
+        cfg = make_cfg(self.bot, self.http, self.data_dir, self.args, throttle=throttle)
+        return QzoneAPI(QzoneSession(cfg), cfg, base_url=self.server.base_url)  # type: ignore[arg-type]
+
+    async def run(
+        self, name: str, fn: Callable[[], Awaitable[dict[str, Any]]]
+    ) -> dict[str, Any]:
+        self.server.reset()
+        self.bot.calls.clear()
+        start = time.perf_counter()
+        result = await fn()
+        result = {
+            "ms": round((time.perf_counter() - start) * 1000, 1),
+            **result,
+            "server_calls": dict(self.server.calls),
+            "rate_limited": dict(self.server.rate_limited),
+            "faults": dict(self.server.faults),
+        }
+        print(
+            f"{name:<20} {result['ms']:>9.1f} ms  {json.dumps(result, ensure_ascii=False)}"
+        )
+        return result
+
+    @staticmethod
+    def outcome(results: list[Any]) -> dict[str, int]:
+        count = {"ok": 0, "failed": 0, "circuit_open": 0}
+        for r in results:
+            if isinstance(r, CircuitOpenError):
+                count["circuit_open"] += 1
+            elif isinstance(r, BaseException) or not r.ok:
+                count["failed"] += 1
+            else:
+                count["ok"] += 1
+        return count
+
+    async def read_burst(self, throttle: bool) -> dict[str, Any]:
+        api = self.api(throttle=throttle)
+        posts = [Post(uin=10001, tid=f"t{i}") for i in range(self.args.burst)]
+        results = await asyncio.gather(
+            *(api.get_detail(p) for p in posts), return_exceptions=True
+        )
+        return {
+            **self.outcome(results),
+            "throttle": api.throttle.stats()["endpoints"].get(DETAIL, {}),
+            "breaker": api.breaker_stats().get(DETAIL, {}),
+        }
+
+    async def retry(self) -> dict[str, Any]:
+        api = self.api()
+        self.server.fail(DETAIL, "error", times=2)
+        resp = await api.get_detail(Post(uin=10001, tid="retry"))
+        return {"ok": resp.ok, "breaker": api.breaker_stats()[DETAIL]}
+
+    async def breaker(self) -> dict[str, Any]:
+        api = self.api()
+        self.server.fail(VISITOR, "error", times=100)
+        results = []
+        for _ in range(4):
+            try:
+                results.append(await api.get_visitor())
+            except Exception as e:
+                results.append(e)
+        return {**self.outcome(results), "breaker": api.breaker_stats()[VISITOR]}
+
+    async def relogin(self) -> dict[str, Any]:
+        api = self.api()
+        self.server.fail("emotion_cgi_msglist_v6", "login")
+        resp = await api.get_feeds("10001", num=20)
+        return {
+            "ok": resp.ok,
+            "msglist": len(resp.data.get("msglist") or []),
+            "get_cookies": self.bot.calls["get_cookies"],
+        }
+
+    async def faults(self) -> dict[str, Any]:
+        api = self.api()
+        codes = {}
+        for fault in ("forbidden", "empty"):
+            self.server.fail("feeds3_html_more", fault)
+            resp = await api.get_recent_feeds()
+            codes[fault] = {"ok": resp.ok, "code": resp.code, "message": resp.message}
+        return {"responses": codes}
+
+    async def publish(self) -> dict[str, Any]:
+        api = self.api()
+        base = self.server.base_url
+        post = Post(text="基准测试", images=[f"{base}/img/{i}.jpg" for i in range(9)])
+        resp = await api.publish(post)
+        post.uin, post.tid = 10001, resp.data.get("tid")
+        comment = Comment(uin=20000, nickname="评论者", content="好", create_time=1)
+        rest = [
+            await api.like(post),
+            await api.comment(post, "评论"),
+            await api.reply(post, comment, "回复"),
+            await api.delete(str(post.tid)),
+        ]
+        return {
+            **self.outcome([resp, *rest]),
+            "upload_throttle": api.throttle.stats()["endpoints"]["cgi_upload_image"],
+        }
+
+    async def close(self) -> None:
+        await self.http.close()
+
+
+async def main_async(args: argparse.Namespace) -> dict[str, Any]:
+    server = FakeQzone(
+        latency=args.latency,
+        jitter=args.jitter,
+        limits={DETAIL: (args.server_rate, int(args.server_rate))},
+    )
+    await server.start()
+    with tempfile.TemporaryDirectory() as tmp:
+        bench = Bench(args, server, Path(tmp))
+        try:
+            results = {
+                "read_burst[off]": await bench.run(
+                    "read_burst[off]", lambda: bench.read_burst(False)
+                ),
+                "read_burst[on]": await bench.run(
+                    "read_burst[on]", lambda: bench.read_burst(True)
+                ),
+                "retry": await bench.run("retry", bench.retry),
+                "breaker": await bench.run("breaker", bench.breaker),
+                "relogin": await bench.run("relogin", bench.relogin),
+                "faults": await bench.run("faults", bench.faults),
+                "publish": await bench.run("publish", bench.publish),
+            }
+        finally:
+            await bench.close()
+            await server.close()
+    return {
+        "meta": {k: v for k, v in vars(args).items() if k != "output"},
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="QzoneAPI 对假 QQ 空间服务的基准")
+    parser.add_argument(
+        "--latency", type=float, default=0.01, help="服务端单次请求延迟（秒）"
+    )
+    parser.add_argument("--jitter", type=float, default=0.0, help="延迟抖动上限（秒）")
+    parser.add_argument(
+        "--server-rate", type=float, default=4.0, help="服务端详情接口限流（次/秒）"
+    )
+    parser.add_argument(
+        "--read-rate", type=float, default=4.0, help="客户端读接口限速（次/秒）"
+    )
+    parser.add_argument(
+        "--upload-rate", type=float, default=4.0, help="客户端上传图片限速（次/秒）"
+    )
+    parser.add_argument("--burst", type=int, default=16, help="并发拉取详情的数量")
+    parser.add_argument("-o", "--output", type=Path, help="结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    logger.setLevel(logging.ERROR)
+    report = asyncio.run(main_async(args))
+    if args.output:
+        args.output.write_text(
+            json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+进程内的假 OneBot 客户端，替代 cfg.client（aiocqhttp.CQHttp）做基准与联调
+
+- 提供插件用到的接口：get_group_msg_history / get_cookies / get_login_info /
+  get_group_list / send_group_msg / send_private_msg，以及 api.call_action
+- 每次调用按 latency（可加 jitter）睡眠，模拟协议端往返耗时
+- 群聊历史按 history_size 合成，分页方式与 LLMAction._get_msg_contexts 的用法对应：
+  message_seq 为 0 时从最新一条开始，否则返回早于该 seq 的 count 条，按时间升序
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from collections import Counter
+from typing import Any
+
+
+class _Api:
+    """对应 CQHttp.api：按动作名分发到同名方法"""
+
+    def __init__(self, bot: FakeOneBot):
+        self._bot = bot
+
+    async def call_action(self, action: str, **params: Any) -> Any:
+        handler = getattr(self._bot, action, None)
+        if handler is None:
+            raise RuntimeError(f"FakeOneBot 不支持动作 {action}")
+        return await handler(**params)
+
+
+class FakeOneBot:
+    def __init__(
+        self,
+        *,
+        uin: int = 10001,
+        nickname: str = "测试账号",
+        groups: int = 5,
+        history_size: int = 2000,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        seed: int = 0,
+    ):
+        self.uin = uin
+        self.nickname = nickname
+        self.group_ids = [20000 + i for i in range(groups)]
+        self.history_size = history_size
+        self.latency = latency
+        self.jitter = jitter
+        self.api = _Api(self)
+        self.calls: Counter[str] = Counter()
+        """各接口的调用次数"""
+        self.sent: list[tuple[str, int, Any]] = []
+        """已发送的消息：(group / private, 目标 id, 消息段)"""
+        self._rng = random.Random(seed)
+
+    async def _roundtrip(self, action: str) -> None:
+        self.calls[action] += 1
+        delay = self.latency
+        if self.jitter:
+            delay += self._rng.uniform(0, self.jitter)
+        # latency 为 0 时也让出一次事件循环，与真实 I/O 的调度行为一致
+        await asyncio.sleep(delay)
+
+    def _message(self, group_id: int, message_id: int) -> dict[str, Any]:
+        user = 30000 + message_id % 97
+        return {
+            "message_id": message_id,
+            "group_id": group_id,
+            "time": 1767225600 + message_id,
+            "sender": {"user_id": user, "nickname": f"群友{user % 1000:03d}"},
+            "message": [
+                {"type": "text", "data": {"text": f"第 {message_id} 条消息，"}},
+                {"type": "face", "data": {"id": "14"}},
+                {
+                    "type": "text",
+                    "data": {"text": "今天吃什么？" * (1 + message_id % 4)},
+                },
+            ],
+        }
+
+    async def get_group_msg_history(
+        self,
+        group_id: int | str,
+        message_seq: int = 0,
+        count: int = 20,
+        **_: Any,
+    ) -> dict[str, Any]:
+        await self._roundtrip("get_group_msg_history")
+        end = self.history_size if not message_seq else int(message_seq) - 1
+        start = max(end - int(count), 0)
+        gid = int(group_id)
+        return {"messages": [self._message(gid, i + 1) for i in range(start, end)]}
+
+    async def get_cookies(self, domain: str = "", **_: Any) -> dict[str, str]:
+        await self._roundtrip("get_cookies")
+        return {
+            "cookies": f"uin=o{self.uin}; skey=@FAKEskey; p_skey=FAKE_p_skey_{domain}"
+        }
+
+    async def get_login_info(self, **_: Any) -> dict[str, Any]:
+        await self._roundtrip("get_login_info")
+        return {"user_id": self.uin, "nickname": self.nickname}
+
+    async def get_group_list(self, **_: Any) -> list[dict[str, Any]]:
+        await self._roundtrip("get_group_list")
+        return [
+            {"group_id": gid, "group_name": f"测试群{gid}", "member_count": 200}
+            for gid in self.group_ids
+        ]
+
+    async def send_group_msg(
+        self, group_id: int, message: Any, **_: Any
+    ) -> dict[str, int]:
+        await self._roundtrip("send_group_msg")
+        self.sent.append(("group", int(group_id), message))
+        return {"message_id": len(self.sent)}
+
+    async def send_private_msg(
+        self, user_id: int, message: Any, **_: Any
+    ) -> dict[str, int]:
+        await self._roundtrip("send_private_msg")
+        self.sent.append(("private", int(user_id), message))
+        return {"message_id": len(self.sent)}
@@ -0,0 +1,312 @@
+"""
+本地假 QQ 空间服务（aiohttp.web），配合 QzoneAPI(base_url=...) 做基准与联调
+
+- 按 URL 路径最后一段分发（与 QzoneThrottle.endpoint_name 一致），覆盖
+  发说说 / 上传图片 / 点赞 / 评论 / 回复 / 删除 / 说说列表 / 详情 / 动态流 / 访客
+- 读接口回放 bench/fixtures 下录制（已脱敏）的响应
+- 每次请求按 latency（可加 jitter）睡眠，模拟公网往返耗时
+- 错误注入：fail() 按接口排队指定次数的故障，或按 error_rate 随机注入
+  login   → code=-3000（登录失效）
+  forbidden → HTTP 403
+  empty   → 200 空响应体
+  error   → HTTP 500
+- 按接口限流（令牌桶），超出时返回 HTTP 429
+- /img/<n>.jpg 返回生成的测试图片，供发说说时下载
+
+单独运行（在插件根目录执行）：
+    python bench/fake_qzone.py --port 8081 --latency 0.05 --limit emotion_cgi_msgdetail_v6=4:4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import random
+import time
+from collections import Counter, deque
+from pathlib import Path
+from typing import Any
+
+from aiohttp import web
+from PIL import Image
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+FAULTS = ("login", "forbidden", "empty", "error")
+"""支持注入的故障类型"""
+
+
+class _Bucket:
+    """服务端令牌桶：rate 次/秒，允许突发 burst 次"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = max(float(rate), 0.01)
+        self.burst = max(int(burst), 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    def take(self) -> bool:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
+class FakeQzone:
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        limits: dict[str, tuple[float, int]] | None = None,
+        error_rate: float = 0.0,
+        error_kind: str = "error",
+        seed: int = 0,
+    ):
+        if error_kind not in FAULTS:
+            raise ValueError(f"未知故障类型 {error_kind}，可选 {FAULTS}")
+        self.latency = latency
+        self.jitter = jitter
+        self.limits = dict(limits or {})
+        """接口名 → (速率, 突发数)"""
+        self.error_rate = error_rate
+        self.error_kind = error_kind
+        self.calls: Counter[str] = Counter()
+        """各接口收到的请求数（含被限流与注入故障的请求）"""
+        self.rate_limited: Counter[str] = Counter()
+        """各接口因限流返回 429 的次数"""
+        self.faults: Counter[str] = Counter()
+        """已注入的故障：接口名:故障类型 → 次数"""
+        self._queued: dict[str, deque[str]] = {}
+        self._buckets: dict[str, _Bucket] = {}
+        self._rng = random.Random(seed)
+        self._seq = 0
+        self._fixtures = {
+            name: (FIXTURES / f"{name}.txt").read_text(encoding="utf-8")
+            for name in ("msglist", "msgdetail", "feeds3", "visitor")
+        }
+        self._images: dict[int, bytes] = {}
+        self._runner: web.AppRunner | None = None
+        self.base_url = ""
+
+        self._handlers = {
+            "cgi_upload_image": self._upload,
+            "emotion_cgi_publish_v6": self._publish,
+            "internal_dolike_app": self._ok,
+            "emotion_cgi_re_feeds": self._comment,
+            "emotion_cgi_delete_v6": self._ok,
+            "emotion_cgi_msglist_v6": self._fixture("msglist"),
+            "emotion_cgi_msgdetail_v6": self._fixture("msgdetail"),
+            "feeds3_html_more": self._fixture("feeds3"),
+            "cgi_get_visitor_more": self._fixture("visitor"),
+        }
+
+    # ------------------------------------------------------------ 控制
+
+    def fail(self, endpoint: str, fault: str, times: int = 1) -> None:
+        """让 endpoint 接下来的 times 次请求返回指定故障"""
+        if fault not in FAULTS:
+            raise ValueError(f"未知故障类型 {fault}，可选 {FAULTS}")
+        self._queued.setdefault(endpoint, deque()).extend([fault] * times)
+
+    def reset(self) -> None:
+        """清空计数、排队的故障与限流状态"""
+        self.calls.clear()
+        self.rate_limited.clear()
+        self.faults.clear()
+        self._queued.clear()
+        self._buckets.clear()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        app = web.Application(client_max_size=64 * 1024**2)
+        app.router.add_get("/img/{n}.jpg", self._image)
+        app.router.add_route("*", "/{tail:.*}", self._dispatch)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        self.base_url = f"http://{host}:{self._runner.addresses[0][1]}"
+        return self.base_url
+
+    async def close(self) -> None:
+        runner, self._runner = self._runner, None
+        if runner is not None:
+            await runner.cleanup()
+
+    # ------------------------------------------------------------ 分发
+
+    def _next_fault(self, endpoint: str) -> str | None:
+        queued = self._queued.get(endpoint)
+        if queued:
+            return queued.popleft()
+        if self.error_rate and self._rng.random() < self.error_rate:
+            return self.error_kind
+        return None
+
+    def _allow(self, endpoint: str) -> bool:
+        limit = self.limits.get(endpoint)
+        if limit is None:
+            return True
+        bucket = self._buckets.get(endpoint)
+        if bucket is None:
+            bucket = self._buckets[endpoint] = _Bucket(*limit)
+        return bucket.take()
+
+    async def _dispatch(self, request: web.Request) -> web.StreamResponse:
+        endpoint = request.path.rstrip("/").rsplit("/", 1)[-1]
+        handler = self._handlers.get(endpoint)
+        if handler is None:
+            return web.Response(status=404, text=f"unknown endpoint {endpoint}")
+        self.calls[endpoint] += 1
+        form = await request.post() if request.method == "POST" else {}
+
+        delay = self.latency
+        if self.jitter:
+            delay += self._rng.uniform(0, self.jitter)
+        await asyncio.sleep(delay)
+
+        if not self._allow(endpoint):
+            self.rate_limited[endpoint] += 1
+            return web.Response(status=429, text="")
+        if fault := self._next_fault(endpoint):
+            self.faults[f"{endpoint}:{fault}"] += 1
+            return self._fault_response(fault)
+        return await handler(request, form)
+
+    @staticmethod
+    def _fault_response(fault: str) -> web.Response:
+        if fault == "login":
+            body = {"code": -3000, "subcode": -4001, "message": "请先登录空间"}
+            return web.json_response(body)
+        if fault == "forbidden":
+            return web.Response(status=403, text="<html>403 Forbidden</html>")
+        if fault == "empty":
+            return web.Response(status=200, text="")
+        return web.Response(status=500, text="<html>500 Internal Server Error</html>")
+
+    # ------------------------------------------------------------ 接口
+
+    def _fixture(self, name: str):
+        async def handler(request: web.Request, form: Any) -> web.Response:
+            return web.Response(text=self._fixtures[name], content_type="text/html")
+
+        return handler
+
+    def _next_id(self) -> str:
+        self._seq += 1
+        return f"fake{self._seq:08d}"
+
+    async def _ok(self, request: web.Request, form: Any) -> web.Response:
+        return web.json_response({"code": 0, "subcode": 0, "message": ""})
+
+    async def _publish(self, request: web.Request, form: Any) -> web.Response:
+        return web.json_response(
+            {
+                "code": 0,
+                "subcode": 0,
+                "message": "",
+                "tid": self._next_id(),
+                "now": int(time.time()),
+            }
+        )
+
+    async def _comment(self, request: web.Request, form: Any) -> web.Response:
+        # format=fs：响应是回调父页面的 HTML 片段
+        body = {"code": 0, "subcode": 0, "message": "", "data": {}}
+        if form.get("commentId"):
+            self.calls["reply"] += 1
+        return web.Response(
+            text=f"<script>frameElement.callback({json.dumps(body)});</script>",
+            content_type="text/html",
+        )
+
+    async def _upload(self, request: web.Request, form: Any) -> web.Response:
+        lloc = self._next_id()
+        return web.json_response(
+            {
+                "ret": 0,
+                "msg": "",
+                "data": {
+                    "url": f"http://a1.qpic.cn/psc?/{lloc}/0&bo={lloc}BO",
+                    "albumid": "V00FAKEalbum",
+                    "lloc": lloc,
+                    "sloc": lloc,
+                    "type": 1,
+                    "height": 640,
+                    "width": 640,
+                },
+            }
+        )
+
+    def image(self, n: int) -> bytes:
+        """第 n 张测试图片（纯色 JPEG，不同 n 内容不同）"""
+        if n not in self._images:
+            color = ((n * 47) % 256, (n * 89) % 256, (n * 131) % 256)
+            buf = io.BytesIO()
+            Image.new("RGB", (640, 640), color).save(buf, "JPEG", quality=90)
+            self._images[n] = buf.getvalue()
+        return self._images[n]
+
+    async def _image(self, request: web.Request) -> web.Response:
+        self.calls["img"] += 1
+        n = int(request.match_info["n"])
+        return web.Response(body=self.image(n), content_type="image/jpeg")
+
+
+def parse_limit(text: str) -> tuple[str, tuple[float, int]]:
+    """解析 "接口名=速率:突发数"，突发数可省略（默认等于速率取整）"""
+    name, _, spec = text.partition("=")
+    rate, _, burst = spec.partition(":")
+    return name, (float(rate), int(burst or max(int(float(rate)), 1)))
+
+
+async def serve(args: argparse.Namespace) -> None:
+    server = FakeQzone(
+        latency=args.latency,
+        jitter=args.jitter,
+        limits=dict(parse_limit(s) for s in args.limit),
+        error_rate=args.error_rate,
+        error_kind=args.error_kind,
+    )
+    base_url = await server.start(args.host, args.port)
+    print(f"假 QQ 空间服务已启动：{base_url}（Ctrl+C 退出）")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+        print(f"请求数：{dict(server.calls)}")
+        print(f"限流：{dict(server.rate_limited)}  故障：{dict(server.faults)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="假 QQ 空间服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0, help="单次请求延迟（秒）")
+    parser.add_argument("--jitter", type=float, default=0.0, help="延迟抖动上限（秒）")
+    parser.add_argument(
+        "--limit",
+        action="append",
+        default=[],
+        help="接口限流，如 emotion_cgi_msgdetail_v6=4:4，可重复",
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="随机注入故障的概率"
+    )
+    parser.add_argument(
+        "--error-kind", choices=FAULTS, default="error", help="随机注入的故障类型"
+    )
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -18,6 +18,8 @@ from astrbot.core.utils.astrbot_path import (
     get_astrbot_temp_path,
 )
 
+from .http_session import HttpSessionRegistry
+
 
 class ConfigNode:
     """
@@ -147,15 +149,38 @@ class TriggerConfig(ConfigNode):
     like_when_comment: bool
 
 
+class ThrottleConfig(ConfigNode):
+    enabled: bool
+    read_rate: float
+    write_rate: float
+    burst: int
+    max_inflight: int
+    upload_rate: float
+    upload_burst: int
+    upload_inflight: int
+
+
+class ImageConfig(ConfigNode):
+    compress: bool
+    max_side: int
+    quality: int
+    min_kb: int
+
+
 class PluginConfig(ConfigNode):
     manage_group: str
     use_builtin_renderer: bool
+    render_workers: int
     pillowmd_style_dir: str
     llm: LLMConfig
     source: SourceConfig
     trigger: TriggerConfig
     cookie_ttl: int
     timeout: int
+    throttle: ThrottleConfig
+    image: ImageConfig
+    detail_concurrency: int
+    parse_workers: int
     show_name: bool
 
     _DB_VERSION = 5
@@ -194,6 +219,7 @@ class PluginConfig(ConfigNode):
         self.save_config()
 
         self.client: CQHttp | None = None
+        self.http = HttpSessionRegistry()
 
     def _normalize_id(self):
         """仅保留纯数字ID"""
@@ -1,6 +1,12 @@
 # pots.py
+from __future__ import annotations
 
+
+import asyncio
 import json
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
 from typing import Literal, get_args
 
 import aiosqlite
@@ -22,18 +28,194 @@ PostKey = Literal[
     "videos",
     "create_time",
     "rt_con",
-    "comments",
     "extra_text",
 ]
 POST_KEYS = set(get_args(PostKey))
 
 
+class SQLitePool:
+    """
+    长连接池：一个写连接 + 若干只读连接
+
+    - 写连接串行使用（asyncio.Lock），事务结束自动 commit / rollback
+    - 读连接放在队列里复用，WAL 模式下读写互不阻塞
+    """
+
+    READER_SIZE = 3
+    """只读连接数量"""
+    BUSY_TIMEOUT_MS = 5000
+    """锁等待超时（毫秒）"""
+    CACHE_SIZE_KIB = 8192
+    """每个连接的页缓存大小（KiB）"""
+    MMAP_SIZE = 64 * 1024 * 1024
+    """内存映射大小（字节）"""
+
+    def __init__(self, db_path: Path, reader_size: int = READER_SIZE):
+        self.db_path = db_path
+        self.reader_size = max(int(reader_size), 1)
+        self._writer: aiosqlite.Connection | None = None
+        self._write_lock = asyncio.Lock()
+        self._readers: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        self._all_readers: list[aiosqlite.Connection] = []
+
+    @property
+    def opened(self) -> bool:
+        return self._writer is not None
+
+    async def _connect(self, *, readonly: bool) -> aiosqlite.Connection:
+        conn = await aiosqlite.connect(self.db_path)
+        await conn.execute(f"PRAGMA busy_timeout = {self.BUSY_TIMEOUT_MS}")
+        await conn.execute(f"PRAGMA cache_size = -{self.CACHE_SIZE_KIB}")
+        await conn.execute(f"PRAGMA mmap_size = {self.MMAP_SIZE}")
+        await conn.execute("PRAGMA temp_store = MEMORY")
+        if readonly:
+            await conn.execute("PRAGMA query_only = 1")
+        else:
+            await conn.execute("PRAGMA journal_mode = WAL")
+            await conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+
+    async def open(self) -> None:
+        """打开连接（重复调用无副作用）"""
+        if self._writer is not None:
+            return
+        # 先建写连接，确保 WAL 模式在读连接之前生效
+        self._writer = await self._connect(readonly=False)
+        for _ in range(self.reader_size):
+            conn = await self._connect(readonly=True)
+            self._all_readers.append(conn)
+            self._readers.put_nowait(conn)
+
+    async def close(self) -> None:
+        """关闭全部连接"""
+        writer, self._writer = self._writer, None
+        readers, self._all_readers = self._all_readers, []
+        self._readers = asyncio.Queue()
+        for conn in readers:
+            await conn.close()
+        if writer is not None:
+            async with self._write_lock:
+                await writer.close()
+
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """借出一个只读连接"""
+        if self._writer is None:
+            raise RuntimeError("数据库尚未初始化")
+        conn = await self._readers.get()
+        try:
+            yield conn
+        finally:
+            if conn in self._all_readers:
+                self._readers.put_nowait(conn)
+
+    @asynccontextmanager
+    async def writer(self) -> AsyncIterator[aiosqlite.Connection]:
+        """独占写连接，退出时提交事务，异常时回滚"""
+        if self._writer is None:
+            raise RuntimeError("数据库尚未初始化")
+        async with self._write_lock:
+            conn = self._writer
+            try:
+                yield conn
+            except BaseException:
+                await conn.rollback()
+                raise
+            else:
+                await conn.commit()
+
+
 class PostDB:
+    _POSTS_SCHEMA = """
+        CREATE TABLE IF NOT EXISTS posts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            tid TEXT UNIQUE,
+            uin INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            avatar_url TEXT,
+            gin INTEGER NOT NULL,
+            text TEXT NOT NULL,
+            images TEXT NOT NULL CHECK(json_valid(images)),
+            videos TEXT NOT NULL DEFAULT '[]' CHECK(json_valid(videos)),
+            anon INTEGER NOT NULL CHECK(anon IN (0,1)),
+            status TEXT NOT NULL,
+            create_time INTEGER NOT NULL,
+            rt_con TEXT NOT NULL DEFAULT '',
+            comments TEXT NOT NULL DEFAULT '[]' CHECK(json_valid(comments)),
+            extra_text TEXT
+        )
+    """
+    """posts 表结构（v0），之后的变更都走 _MIGRATIONS"""
+
+    _MIGRATIONS: tuple[tuple[str, ...], ...] = (
+        # v1: 二级索引（表白墙按状态、按用户、按时间的查询）
+        (
+            "CREATE INDEX IF NOT EXISTS idx_posts_status_id ON posts(status, id)",
+            "CREATE INDEX IF NOT EXISTS idx_posts_uin_time ON posts(uin, create_time)",
+            "CREATE INDEX IF NOT EXISTS idx_posts_gin_status ON posts(gin, status)",
+            "CREATE INDEX IF NOT EXISTS idx_posts_time ON posts(create_time)",
+        ),
+        # v2: 评论拆表，并把 posts.comments 里的 JSON 一次性迁移过去
+        (
+            """
+            CREATE TABLE IF NOT EXISTS comments (
+                post_id INTEGER NOT NULL REFERENCES posts(id) ON DELETE CASCADE,
+                seq INTEGER NOT NULL,
+                comment_tid INTEGER NOT NULL DEFAULT 0,
+                uin INTEGER NOT NULL,
+                nickname TEXT NOT NULL DEFAULT '',
+                content TEXT NOT NULL DEFAULT '',
+                create_time INTEGER NOT NULL DEFAULT 0,
+                create_time_str TEXT NOT NULL DEFAULT '',
+                parent_tid INTEGER,
+                source_name TEXT NOT NULL DEFAULT '',
+                source_url TEXT NOT NULL DEFAULT '',
+                PRIMARY KEY (post_id, seq)
+            ) WITHOUT ROWID
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_comments_post_uin ON comments(post_id, uin)",
+            "CREATE INDEX IF NOT EXISTS idx_comments_post_tid ON comments(post_id, comment_tid)",
+            """
+            INSERT OR IGNORE INTO comments (
+                post_id, seq, comment_tid, uin, nickname, content,
+                create_time, create_time_str, parent_tid, source_name, source_url
+            )
+            SELECT
+                p.id, CAST(j.key AS INTEGER),
+                COALESCE(json_extract(j.value, '$.tid'), 0),
+                COALESCE(json_extract(j.value, '$.uin'), 0),
+                COALESCE(json_extract(j.value, '$.nickname'), ''),
+                COALESCE(json_extract(j.value, '$.content'), ''),
+                COALESCE(json_extract(j.value, '$.create_time'), 0),
+                COALESCE(json_extract(j.value, '$.create_time_str'), ''),
+                json_extract(j.value, '$.parent_tid'),
+                COALESCE(json_extract(j.value, '$.source_name'), ''),
+                COALESCE(json_extract(j.value, '$.source_url'), '')
+            FROM posts AS p, json_each(p.comments) AS j
+            """,
+            "UPDATE posts SET comments = '[]' WHERE comments != '[]'",
+        ),
+    )
+    """按版本顺序执行的迁移语句，版本号记录在 PRAGMA user_version"""
+
+    _POST_COLUMNS = (
+        "id, tid, uin, name, avatar_url, gin, text, images, videos, anon, "
+        "status, create_time, rt_con, comments, extra_text"
+    )
+    """显式列顺序：旧库的 avatar_url 是 ALTER 追加在末尾的，不能依赖 SELECT *"""
+
+    _COMMENT_COLUMNS = (
+        "comment_tid, uin, nickname, content, create_time, "
+        "create_time_str, parent_tid, source_name, source_url"
+    )
+
     def __init__(self, config: PluginConfig):
         self.db_path = config.db_path
+        self.pool = SQLitePool(self.db_path)
 
     @staticmethod
-    def _row_to_post(row) -> Post:
+    def _row_to_post(row, comments: list[Comment] | None = None) -> Post:
+        """posts.comments 列已废弃，评论由 comments 表单独提供"""
         return Post(
             id=row[0],
             tid=row[1],
@@ -48,38 +230,68 @@ class PostDB:
             status=row[10],
             create_time=row[11],
             rt_con=row[12],
-            comments=[Comment.model_validate(c) for c in json.loads(row[13])],
+            comments=comments or [],
             extra_text=row[14],
         )
 
+    @staticmethod
+    def _row_to_comment(row) -> Comment:
+        return Comment(
+            tid=row[0],
+            uin=row[1],
+            nickname=row[2],
+            content=row[3],
+            create_time=row[4],
+            create_time_str=row[5],
+            parent_tid=row[6],
+            source_name=row[7],
+            source_url=row[8],
+        )
+
+    @staticmethod
+    def _comment_params(post_id: int, seq: int, comment: Comment) -> tuple:
+        return (
+            post_id,
+            seq,
+            comment.tid,
+            comment.uin,
+            comment.nickname,
+            comment.content,
+            comment.create_time,
+            comment.create_time_str,
+            comment.parent_tid,
+            comment.source_name,
+            comment.source_url,
+        )
+
     @staticmethod
     def _encode_urls(urls: list[str]) -> str:
         return json.dumps(urls, ensure_ascii=False)
 
     async def initialize(self):
         """初始化数据库"""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS posts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    tid TEXT UNIQUE,
-                    uin INTEGER NOT NULL,
-                    name TEXT NOT NULL,
-                    avatar_url TEXT,
-                    gin INTEGER NOT NULL,
-                    text TEXT NOT NULL,
-                    images TEXT NOT NULL CHECK(json_valid(images)),
-                    videos TEXT NOT NULL DEFAULT '[]' CHECK(json_valid(videos)),
-                    anon INTEGER NOT NULL CHECK(anon IN (0,1)),
-                    status TEXT NOT NULL,
-                    create_time INTEGER NOT NULL,
-                    rt_con TEXT NOT NULL DEFAULT '',
-                    comments TEXT NOT NULL DEFAULT '[]' CHECK(json_valid(comments)),
-                    extra_text TEXT
-                )
-            """)
+        await self.pool.open()
+        async with self.pool.writer() as db:
+            await db.execute(self._POSTS_SCHEMA)
             await self._ensure_avatar_url_column(db)
-            await db.commit()
+            await self._migrate(db)
+
+    async def close(self):
+        """关闭数据库连接"""
+        if self.pool.opened:
+            async with self.pool.writer() as db:
+                await db.execute("PRAGMA optimize")
+        await self.pool.close()
+
+    @classmethod
+    async def _migrate(cls, db: aiosqlite.Connection) -> None:
+        async with db.execute("PRAGMA user_version") as cursor:
+            row = await cursor.fetchone()
+        version = row[0] if row else 0
+        for target in range(version + 1, len(cls._MIGRATIONS) + 1):
+            for statement in cls._MIGRATIONS[target - 1]:
+                await db.execute(statement)
+            await db.execute(f"PRAGMA user_version = {target}")
 
     @staticmethod
     async def _ensure_avatar_url_column(db: aiosqlite.Connection) -> None:
@@ -89,14 +301,52 @@ class PostDB:
             return
         await db.execute("ALTER TABLE posts ADD COLUMN avatar_url TEXT")
 
+    async def _load_comments(
+        self, db: aiosqlite.Connection, post_ids: list[int]
+    ) -> dict[int, list[Comment]]:
+        """批量读取多条稿件的评论，按原始顺序返回"""
+        result: dict[int, list[Comment]] = {post_id: [] for post_id in post_ids}
+        if not post_ids:
+            return result
+        placeholders = ",".join("?" * len(post_ids))
+        query = f"""
+            SELECT post_id, {self._COMMENT_COLUMNS} FROM comments
+            WHERE post_id IN ({placeholders})
+            ORDER BY post_id, seq
+        """
+        async with db.execute(query, post_ids) as cursor:
+            async for row in cursor:
+                result[row[0]].append(self._row_to_comment(row[1:]))
+        return result
+
+    async def _rows_to_posts(self, db: aiosqlite.Connection, rows) -> list[Post]:
+        comments = await self._load_comments(db, [row[0] for row in rows])
+        return [self._row_to_post(row, comments[row[0]]) for row in rows]
+
+    async def _replace_comments(
+        self, db: aiosqlite.Connection, post_id: int, comments: list[Comment]
+    ) -> None:
+        await db.execute("DELETE FROM comments WHERE post_id = ?", (post_id,))
+        if not comments:
+            return
+        await db.executemany(
+            f"""
+            INSERT INTO comments (post_id, seq, {self._COMMENT_COLUMNS})
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                self._comment_params(post_id, seq, comment)
+                for seq, comment in enumerate(comments)
+            ],
+        )
+
     async def add(self, post: Post) -> int:
         """添加稿件"""
-        async with aiosqlite.connect(self.db_path) as db:
-            comment_dicts = [c.model_dump() for c in post.comments]
+        async with self.pool.writer() as db:
             cur = await db.execute(
                 """
-                INSERT INTO posts (tid, uin, name, avatar_url, gin, text, images, videos, anon, status, create_time, rt_con, comments, extra_text)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO posts (tid, uin, name, avatar_url, gin, text, images, videos, anon, status, create_time, rt_con, extra_text)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     post.tid or None,
@@ -111,13 +361,12 @@ class PostDB:
                     post.status,
                     post.create_time,
                     post.rt_con,
-                    json.dumps(comment_dicts, ensure_ascii=False),
                     post.extra_text,
                 ),
             )
-            await db.commit()
             last_id = cur.lastrowid  # 获取自增ID
             assert last_id is not None
+            await self._replace_comments(db, last_id, post.comments)
             return last_id
 
     async def get(self, value, key: PostKey = "id") -> Post | None:
@@ -129,18 +378,24 @@ class PostDB:
             raise ValueError("必须提供查询值")
         if key not in POST_KEYS:
             raise ValueError(f"不允许的查询字段: {key}")
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.reader() as db:
             # 关键判断：-1 代表取最大 ID
             if key == "id" and value == -1:
-                query = "SELECT * FROM posts ORDER BY id DESC LIMIT 1"
-                async with db.execute(query) as cursor:
-                    row = await cursor.fetchone()
-                    return self._row_to_post(row) if row else None
-            # 普通查询保持原逻辑
-            query = f"SELECT * FROM posts WHERE {key} = ? LIMIT 1"
-            async with db.execute(query, (value,)) as cursor:
+                query = (
+                    f"SELECT {self._POST_COLUMNS} FROM posts ORDER BY id DESC LIMIT 1"
+                )
+                params: tuple = ()
+            else:
+                # 普通查询保持原逻辑
+                query = (
+                    f"SELECT {self._POST_COLUMNS} FROM posts WHERE {key} = ? LIMIT 1"
+                )
+                params = (value,)
+            async with db.execute(query, params) as cursor:
                 row = await cursor.fetchone()
-                return self._row_to_post(row) if row else None
+            if not row:
+                return None
+            return (await self._rows_to_posts(db, [row]))[0]
 
     async def list(
         self,
@@ -161,25 +416,26 @@ class PostDB:
 
         order = "DESC" if reverse else "ASC"
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.reader() as db:
             query = f"""
-                SELECT * FROM posts
+                SELECT {self._POST_COLUMNS} FROM posts
                 ORDER BY id {order}
                 LIMIT ? OFFSET ?
             """
             async with db.execute(query, (limit, offset)) as cursor:
                 rows = await cursor.fetchall()
-                return [self._row_to_post(row) for row in rows]
+            return await self._rows_to_posts(db, rows)
 
     async def update(self, post: Post) -> None:
-        async with aiosqlite.connect(self.db_path) as db:
-            comment_dicts = [c.model_dump() for c in post.comments]
+        if post.id is None:
+            raise ValueError("稿件 id 为空，无法更新")
+        async with self.pool.writer() as db:
             await db.execute(
                 """
                 UPDATE posts SET
                     tid = ?, uin = ?, name = ?, avatar_url = ?, gin = ?, text = ?,
                     images = ?, videos = ?, anon = ?, status = ?,
-                    create_time = ?, rt_con = ?, comments = ?, extra_text = ?
+                    create_time = ?, rt_con = ?, extra_text = ?
                 WHERE id = ?
                 """,
                 (
@@ -195,40 +451,157 @@ class PostDB:
                     post.status,
                     post.create_time,
                     post.rt_con,
-                    json.dumps(comment_dicts, ensure_ascii=False),
                     post.extra_text,
                     post.id,
                 ),
             )
-            await db.commit()
+            await self._replace_comments(db, post.id, post.comments)
+
+    def _upsert_params(self, post: Post) -> tuple:
+        return (
+            post.id,
+            post.tid or None,
+            post.uin,
+            post.name,
+            post.avatar_url,
+            post.gin,
+            post.text,
+            self._encode_urls(post.images),
+            self._encode_urls(post.videos),
+            int(post.anon),
+            post.status,
+            post.create_time,
+            post.rt_con,
+            post.extra_text,
+        )
+
+    _LOOKUP_CHUNK = 500
+    """批量查已有行时每条 IN 查询的参数个数上限（旧版 SQLite 最多 999 个变量）"""
+
+    async def _existing_ids(
+        self, db: aiosqlite.Connection, key: str, values: list
+    ) -> dict:
+        """按 tid 或 id 批量查已有行，返回 {key 值: id}"""
+        found: dict = {}
+        values = list(dict.fromkeys(values))
+        for i in range(0, len(values), self._LOOKUP_CHUNK):
+            chunk = values[i : i + self._LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            async with db.execute(
+                f"SELECT {key}, id FROM posts WHERE {key} IN ({placeholders})", chunk
+            ) as cursor:
+                async for row in cursor:
+                    found[row[0]] = row[1]
+        return found
+
+    async def _save_posts(
+        self, db: aiosqlite.Connection, posts: list[Post]
+    ) -> list[int]:
+        """
+        先一次查出已存在的行，已有的 UPDATE，新的才 INSERT。
+        不用 INSERT ... ON CONFLICT DO UPDATE：posts 是 AUTOINCREMENT 表，
+        冲突走更新分支也会消耗自增序号，反复同步同一批说说会让稿件编号跳号。
+        """
+        by_tid = await self._existing_ids(db, "tid", [p.tid for p in posts if p.tid])
+        by_id = await self._existing_ids(
+            db, "id", [p.id for p in posts if p.id is not None]
+        )
+        ids: list[int] = []
+        for post in posts:
+            post_id = by_tid.get(post.tid) if post.tid else None
+            if post_id is None and post.id is not None:
+                post_id = by_id.get(post.id)
+            params = self._upsert_params(post)
+            if post_id is None:
+                cur = await db.execute(
+                    """
+                    INSERT INTO posts (id, tid, uin, name, avatar_url, gin, text, images, videos, anon, status, create_time, rt_con, extra_text)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    params,
+                )
+                post_id = cur.lastrowid
+                assert post_id is not None
+            else:
+                await db.execute(
+                    """
+                    UPDATE posts SET
+                        tid = ?, uin = ?, name = ?, avatar_url = ?, gin = ?, text = ?,
+                        images = ?, videos = ?, anon = ?, status = ?,
+                        create_time = ?, rt_con = ?, extra_text = ?
+                    WHERE id = ?
+                    """,
+                    (*params[1:], post_id),
+                )
+            # 同一批里重复出现的 tid / id 后者更新前者
+            if post.tid:
+                by_tid[post.tid] = post_id
+            by_id[post_id] = post_id
+            post.id = post_id
+            await self._replace_comments(db, post_id, post.comments)
+            ids.append(post_id)
+        return ids
 
     async def save(self, post: Post) -> int | None:
         """
         保存 Post：
-        1. 有 tid → 尝试按 tid 更新
-        2. 有 id  → 按 id 更新
-        3. 否则   → 新增
+        1. 有 tid 且已存在 → 按 tid 更新
+        2. 有 id  且已存在 → 按 id 更新
+        3. 否则          → 新增
         """
-        # 1. 优先用 tid 去重
-        if post.tid:
-            old = await self.get(post.tid, key="tid")
-            if old:
-                post.id = old.id
-                await self.update(post)
-                return post.id
-
-        # 2. 有 id 就更新
-        if post.id is not None:
-            await self.update(post)
-            return post.id
-
-        # 3. 新记录
-        post.id = await self.add(post)
-        return post.id
+        async with self.pool.writer() as db:
+            return (await self._save_posts(db, [post]))[0]
+
+    async def save_many(self, posts: list[Post]) -> list[int]:
+        """批量保存 Post，整批共用一个事务与一次已有行查询"""
+        if not posts:
+            return []
+        async with self.pool.writer() as db:
+            return await self._save_posts(db, posts)
+
+    async def add_comment(self, post: Post, comment: Comment) -> None:
+        """追加一条评论，只写 comments 表，不重写稿件本身"""
+        if post.id is None:
+            await self.save(post)
+            return
+        async with self.pool.writer() as db:
+            async with db.execute(
+                "SELECT COALESCE(MAX(seq), -1) + 1 FROM comments WHERE post_id = ?",
+                (post.id,),
+            ) as cursor:
+                row = await cursor.fetchone()
+            seq = row[0] if row else 0
+            await db.execute(
+                f"""
+                INSERT INTO comments (post_id, seq, {self._COMMENT_COLUMNS})
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                self._comment_params(post.id, seq, comment),
+            )
+
+    async def commented_tids(self, tids: list[str], uin: int) -> set[str]:
+        """返回 tids 中已有 uin 评论的那些"""
+        tids = [tid for tid in dict.fromkeys(tids) if tid]
+        if not tids:
+            return set()
+        placeholders = ",".join("?" * len(tids))
+        async with self.pool.reader() as db:
+            async with db.execute(
+                f"""
+                SELECT p.tid FROM posts AS p
+                WHERE p.tid IN ({placeholders}) AND EXISTS (
+                    SELECT 1 FROM comments AS c
+                    WHERE c.post_id = p.id AND c.uin = ?
+                )
+                """,
+                (*tids, uin),
+            ) as cursor:
+                rows = await cursor.fetchall()
+        return {row[0] for row in rows}
 
     async def delete(self, post_id: int) -> int:
         """删除稿件"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.pool.writer() as db:
+            await db.execute("DELETE FROM comments WHERE post_id = ?", (post_id,))
             cur = await db.execute("DELETE FROM posts WHERE id = ?", (post_id,))
-            await db.commit()
             return cur.rowcount
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import socket
+
+import aiohttp
+
+from astrbot.api import logger
+
+
+class HttpSessionRegistry:
+    """
+    插件级 HTTP 会话注册表
+
+    - 所有 ClientSession 共用一个 TCPConnector，复用 keep-alive 连接、DNS 缓存与 TLS 会话
+    - 按用途（name）区分会话，各自携带默认超时与请求头
+    - 插件加载时创建，卸载时统一关闭
+    """
+
+    LIMIT = 100
+    """连接池总连接数"""
+    LIMIT_PER_HOST = 8
+    """单个 host 的最大连接数"""
+    DNS_TTL = 300
+    """DNS 缓存时间（秒）"""
+    KEEPALIVE_TIMEOUT = 30
+    """空闲连接保活时间（秒）"""
+
+    def __init__(self):
+        self._connector: aiohttp.TCPConnector | None = None
+        self._sessions: dict[str, aiohttp.ClientSession] = {}
+
+    def _get_connector(self) -> aiohttp.TCPConnector:
+        if self._connector is None or self._connector.closed:
+            self._connector = aiohttp.TCPConnector(
+                limit=self.LIMIT,
+                limit_per_host=self.LIMIT_PER_HOST,
+                ttl_dns_cache=self.DNS_TTL,
+                keepalive_timeout=self.KEEPALIVE_TIMEOUT,
+                family=socket.AF_INET,
+            )
+        return self._connector
+
+    def get(
+        self,
+        name: str = "default",
+        *,
+        timeout: aiohttp.ClientTimeout | None = None,
+        headers: dict[str, str] | None = None,
+        trust_env: bool = False,
+    ) -> aiohttp.ClientSession:
+        """
+        获取（或首次创建）指定用途的会话。
+        timeout / headers / trust_env 仅在创建时生效。
+        trust_env 默认关闭：带 QQ 空间 cookie 的会话不能走环境变量里的代理。
+        """
+        session = self._sessions.get(name)
+        if session is not None and not session.closed:
+            return session
+        session = aiohttp.ClientSession(
+            connector=self._get_connector(),
+            connector_owner=False,
+            timeout=timeout or aiohttp.ClientTimeout(total=30),
+            headers=headers,
+            trust_env=trust_env,
+        )
+        self._sessions[name] = session
+        return session
+
+    async def close(self) -> None:
+        """关闭全部会话与共享连接池"""
+        sessions, self._sessions = self._sessions, {}
+        for name, session in sessions.items():
+            try:
+                await session.close()
+            except Exception as e:
+                logger.debug(f"关闭 HTTP 会话 {name} 时忽略异常：{e}")
+        connector, self._connector = self._connector, None
+        if connector is not None:
+            await connector.close()
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import functools
+import io
+import re
+import secrets
+import time
+from pathlib import Path
+from typing import Any
+
+import aiofiles
+
+from astrbot.api import logger
+
+
+class MediaTooLargeError(RuntimeError):
+    """上传内容超过大小上限"""
+
+
+class _StagedFile(io.FileIO):
+    """表单解析器写入的暂存文件，累计字节数超过上限时立即中止解析"""
+
+    def __init__(self, media_id: str, path: Path, limit: int):
+        super().__init__(path, "w+")
+        self.media_id = media_id
+        self.limit = limit
+        self.written = 0
+
+    def write(self, data: Any) -> int:
+        self.written += len(data)
+        if self.written > self.limit:
+            raise MediaTooLargeError("图片过大")
+        return super().write(data)
+
+
+class MediaStore:
+    """
+    管理面板上传媒体的暂存区
+
+    - 上传内容边接收边落盘并计数，超过上限立即中止，浏览器只拿到一个短 media id
+    - 发布时按 id 读取文件，发布后删除
+    - 超过 TTL 未使用的文件自动清理
+    """
+
+    TTL = 3600
+    """暂存文件有效期（秒）"""
+    MAX_BYTES = 30 * 1024 * 1024
+    """单个文件大小上限"""
+    FORM_OVERHEAD = 64 * 1024
+    """multipart 请求中分隔符、字段头等非文件内容的余量"""
+    SCHEME = "media://"
+    """返回给前端的 source 前缀"""
+
+    _ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{8,64}$")
+
+    def __init__(self, root: Path, *, ttl: int = TTL, max_bytes: int = MAX_BYTES):
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+
+    def _path(self, media_id: str) -> Path | None:
+        if not self._ID_PATTERN.match(media_id):
+            return None
+        return self.root / f"{media_id}.bin"
+
+    def allocate(self) -> tuple[str, Path]:
+        """分配一个新的 media id 及其落盘路径"""
+        self.purge()
+        media_id = secrets.token_urlsafe(12)
+        return media_id, self.root / f"{media_id}.bin"
+
+    async def receive(
+        self, request: Any, fields: tuple[str, ...]
+    ) -> tuple[str, Any, int]:
+        """
+        接收 multipart 请求（quart.Request）中的一个文件，返回 (media id, 文件字段, 字节数)。
+        Content-Length 超限时不读请求体直接拒绝；否则文件内容在解析时直接写入暂存区，
+        超过上限立即中止，不会先完整落盘再检查。
+        """
+        length = request.content_length
+        if length and length > self.max_bytes + self.FORM_OVERHEAD:
+            raise MediaTooLargeError("图片过大")
+
+        staged: list[_StagedFile] = []
+
+        def stream_factory(*_: Any, **__: Any) -> _StagedFile:
+            media_id, path = self.allocate()
+            fp = _StagedFile(media_id, path, self.max_bytes)
+            staged.append(fp)
+            return fp
+
+        request.form_data_parser_class = functools.partial(
+            request.form_data_parser_class, stream_factory=stream_factory
+        )
+        keep: _StagedFile | None = None
+        try:
+            files = await request.files
+            upload = next((files[f] for f in fields if f in files), None)
+            if upload is None:
+                raise RuntimeError("没有收到图片文件")
+            keep = upload.stream
+            return keep.media_id, upload, keep.written
+        finally:
+            for fp in staged:
+                fp.close()
+                if fp is not keep:
+                    self.discard(fp.media_id)
+
+    def resolve(self, media_id: str) -> Path | None:
+        path = self._path(media_id)
+        if path is None:
+            return None
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        if time.time() - mtime > self.ttl:
+            path.unlink(missing_ok=True)
+            return None
+        return path
+
+    async def read(self, media_id: str) -> bytes:
+        path = self.resolve(media_id)
+        if path is None:
+            raise RuntimeError("图片已过期，请重新上传")
+        async with aiofiles.open(path, "rb") as fp:
+            return await fp.read()
+
+    def discard(self, media_id: str) -> None:
+        if path := self._path(media_id):
+            path.unlink(missing_ok=True)
+
+    def purge(self) -> None:
+        """清理过期文件"""
+        now = time.time()
+        for path in self.root.glob("*.bin"):
+            try:
+                if now - path.stat().st_mtime > self.ttl:
+                    path.unlink(missing_ok=True)
+            except OSError as e:
+                logger.debug(f"清理暂存媒体失败：{path.name} -> {e}")
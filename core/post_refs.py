@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+
+from .model import Post
+
+
+class PostRefStore:
+    """
+    管理面板的说说引用表（"uin:tid" → Post）
+
+    - 有界 LRU，超出容量淘汰最久未访问的引用
+    - 超过 TTL 的引用视为失效，由调用方回退到数据库查询
+    """
+
+    MAX_ENTRIES = 500
+    """引用条目上限"""
+    TTL = 30 * 60
+    """引用有效期（秒）"""
+
+    def __init__(self, *, max_entries: int = MAX_ENTRIES, ttl: int = TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Post]] = OrderedDict()
+
+    @staticmethod
+    def key_of(post: Post) -> str:
+        return f"{post.uin}:{post.tid}"
+
+    def put(self, post: Post) -> str:
+        key = self.key_of(post)
+        self._entries[key] = (time.monotonic() + self.ttl, post)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return key
+
+    def get(self, key: str) -> Post | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, post = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return post
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,16 +1,26 @@
+import asyncio
 import base64
 import time
 from typing import Any
 
+import aiohttp
+
 from astrbot.api import logger
 
 from ..config import PluginConfig
 from ..model import Comment, Post
-from .client import QzoneHttpClient
-from .model import ApiResponse
+from .client import ImageExpiredError, QzoneHttpClient
+from .constants import QZONE_CODE_IMAGE_EXPIRED
+from .model import ApiResponse, QzoneContext
 from .parser import QzoneParser
+from .response_cache import ResponseCache
 from .session import QzoneSession
-from .utils import normalize_images
+from .upload_cache import UploadCache
+from .utils import compress_image, load_image
+
+
+def _b64encode(image: bytes) -> str:
+    return base64.b64encode(image).decode()
 
 
 class QzoneAPI(QzoneHttpClient):
@@ -28,12 +38,55 @@ class QzoneAPI(QzoneHttpClient):
     DELETE_URL = "https://h5.qzone.qq.com/proxy/domain/taotao.qzone.qq.com/cgi-bin/emotion_cgi_delete_v6"
     DETAIL_URL = "https://h5.qzone.qq.com/proxy/domain/taotao.qq.com/cgi-bin/emotion_cgi_msgdetail_v6"
 
-    def __init__(self, session: QzoneSession, config: PluginConfig):
+    HOSTS = (
+        "https://user.qzone.qq.com",
+        "https://h5.qzone.qq.com",
+        "https://up.qzone.qq.com",
+    )
+    """QQ 空间接口所在的域名，可被 base_url 整体替换"""
+    UPLOAD_CONCURRENCY = 4
+    """发说说时同时处理（下载 + 上传）的图片数"""
+
+    def __init__(
+        self,
+        session: QzoneSession,
+        config: PluginConfig,
+        base_url: str | None = None,
+    ):
         super().__init__(session, config)
+        if base_url:
+            self._override_base_url(base_url.rstrip("/"))
+        self.cache = ResponseCache()
+        self._upload_semaphore = asyncio.Semaphore(self.UPLOAD_CONCURRENCY)
+        self.upload_cache = UploadCache(config.data_dir / "upload_cache.json")
+
+    def _override_base_url(self, base_url: str) -> None:
+        """
+        把所有接口地址的域名替换为 base_url（用于本地模拟服务压测，见 bench/bench_qzone.py）。
+        BASE_URL 不替换：它参与 referer 与点赞 unikey/curkey 的拼接，是说说的标识而非请求地址。
+        """
+        for name in dir(type(self)):
+            if not name.endswith("_URL") or name == "BASE_URL":
+                continue
+            url = getattr(self, name)
+            for host in self.HOSTS:
+                if isinstance(url, str) and url.startswith(host):
+                    setattr(self, name, base_url + url[len(host) :])
+                    break
+        logger.warning(f"QQ空间接口已重定向到 {base_url}")
+
+    def _invalidate_post(self, uin: int | str, tid: str | None = None) -> None:
+        """写操作后失效相关读缓存：该说说详情、作者的说说列表、动态流"""
+        if tid is not None:
+            self.cache.invalidate("detail", str(uin), str(tid))
+        self.cache.invalidate("feeds", str(uin))
+        self.cache.invalidate("recent")
 
     async def _upload_image(self, image: bytes) -> ApiResponse:
         """上传单张图片 (本接口较为脆弱)"""
         ctx = await self.session.get_ctx()
+        # 大图 base64 编码耗时明显，放到线程里做
+        picfile = await asyncio.to_thread(_b64encode, image)
         raw = await self.request(
             "POST",
             self.UPLOAD_IMAGE_URL,
@@ -46,7 +99,7 @@ class QzoneAPI(QzoneHttpClient):
                 "p_skey": ctx.p_skey,
                 "output_type": "json",
                 "base64": "1",
-                "picfile": base64.b64encode(image).decode(),
+                "picfile": picfile,
             },
             headers={
                 "referer": f"{self.BASE_URL}/{ctx.uin}",
@@ -57,9 +110,87 @@ class QzoneAPI(QzoneHttpClient):
         logger.debug(raw)
         return ApiResponse.from_raw(raw, code_key="ret", msg_key="msg")
 
+    async def _upload_one(
+        self,
+        item: bytes | str,
+        session: aiohttp.ClientSession,
+        uin: int,
+        use_cache: bool,
+    ) -> tuple[str, tuple[str, str], bool] | None:
+        """
+        下载 → 查缓存 → 压缩 → 编码 → 上传 单张图片
+        返回 (缓存键, (picbo, richval), 是否命中缓存)，下载失败返回 None
+        """
+        async with self._upload_semaphore:
+            img = await load_image(item, session)
+            if img is None:
+                return None
+            key = await asyncio.to_thread(UploadCache.key_of, img, uin)
+            if use_cache and (hit := self.upload_cache.get(key)):
+                return key, hit, True
+            if (opts := self.cfg.image).compress:
+                img = await asyncio.to_thread(
+                    compress_image,
+                    img,
+                    max_side=opts.max_side,
+                    quality=opts.quality,
+                    min_bytes=opts.min_kb * 1024,
+                )
+            resp = await self._upload_image(img)
+        if not resp.ok:
+            raise RuntimeError(f"上传图片失败: {resp.message}")
+        result = QzoneParser.parse_upload_result(resp.data)
+        self.upload_cache.put(key, result)
+        return key, result, False
+
+    async def _upload_images(
+        self, images: list[bytes | str], uin: int, *, use_cache: bool = True
+    ) -> tuple[list[tuple[str, str]], list[str]]:
+        """
+        并发上传多张图片，每张图片的下载、编码、上传串成一条流水线，
+        多张图片之间并行；结果保持输入顺序，任一张上传失败则取消其余。
+        上传结果按账号 uin 缓存，换号后不会复用其他账号的图片。
+        返回 ([(picbo, richval)], 命中缓存的键列表)
+        """
+        session = self.cfg.http.get("download", trust_env=False)
+        tasks = [
+            asyncio.ensure_future(self._upload_one(i, session, uin, use_cache))
+            for i in images
+        ]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            await self.upload_cache.flush()
+        done = [r for r in results if r is not None]
+        return [r[1] for r in done], [r[0] for r in done if r[2]]
+
+    @staticmethod
+    def _attach_images(data: dict[str, Any], uploaded: list[tuple[str, str]]) -> None:
+        data.update(
+            pic_bo=",".join(picbo for picbo, _ in uploaded),
+            richtype="1",
+            richval="\t".join(richval for _, richval in uploaded),
+        )
+
+    @staticmethod
+    def _is_image_expired(raw: dict[str, Any]) -> bool:
+        return QZONE_CODE_IMAGE_EXPIRED in (
+            raw.get("code"),
+            (raw.get("data") or {}).get("ret"),
+        )
+
     async def get_visitor(self) -> ApiResponse:
         """获取访客数"""
         ctx = await self.session.get_ctx()
+        key = ("visitor", ctx.uin)
+        if (cached := self.cache.get(key)) is not None:
+            return cached
+        gen = self.cache.generation
         raw = await self.request(
             "GET",
             self.VISITOR_URL,
@@ -72,7 +203,9 @@ class QzoneAPI(QzoneHttpClient):
                 "clear": 1,
             },
         )
-        return ApiResponse.from_raw(raw)
+        resp = ApiResponse.from_raw(raw)
+        self.cache.put(key, resp, gen)
+        return resp
 
     async def publish(self, post: Post) -> ApiResponse:
         """发表说说, 返回tid"""
@@ -91,30 +224,41 @@ class QzoneAPI(QzoneHttpClient):
             "format": "json",
             "qzreferrer": f"{self.BASE_URL}/{ctx.uin}",
         }
+        cached_keys: list[str] = []
         if post.images:
             logger.debug(f"正在上传图片: {post.images}")
-            pic_bos, richvals = [], []
-            imgs: list[bytes] = await normalize_images(post.images)
-            for img in imgs:
-                resp = await self._upload_image(img)
-                if not resp.ok:
-                    raise RuntimeError(f"上传图片失败: {resp.message}")
-                picbo, richval = QzoneParser.parse_upload_result(resp.data)
-                pic_bos.append(picbo)
-                richvals.append(richval)
-            data.update(
-                pic_bo=",".join(pic_bos),
-                richtype="1",
-                richval="\t".join(richvals),
+            uploaded, cached_keys = await self._upload_images(post.images, ctx.uin)
+            self._attach_images(data, uploaded)
+
+        try:
+            raw = await self._post_emotion(ctx, data)
+            expired = self._is_image_expired(raw)
+        except ImageExpiredError:
+            # 复用的图片过期会先走重登流程，仍过期才抛出；没有复用则原样抛出
+            if not cached_keys:
+                raise
+            expired = True
+
+        if expired and cached_keys:
+            logger.warning("复用的图片已过期，重新上传后再次发布")
+            self.upload_cache.invalidate(cached_keys)
+            ctx = await self.session.get_ctx()
+            uploaded, _ = await self._upload_images(
+                post.images, ctx.uin, use_cache=False
             )
+            self._attach_images(data, uploaded)
+            raw = await self._post_emotion(ctx, data)
 
-        raw = await self.request(
+        self._invalidate_post(ctx.uin)
+        return ApiResponse.from_raw(raw)
+
+    async def _post_emotion(self, ctx: QzoneContext, data: dict[str, Any]) -> dict:
+        return await self.request(
             "POST",
             self.EMOTION_URL,
             params={"g_tk": ctx.gtk2, "uin": ctx.uin},
             data=data,
         )
-        return ApiResponse.from_raw(raw)
 
     async def like(self, post: Post) -> ApiResponse:
         """
@@ -142,6 +286,7 @@ class QzoneAPI(QzoneHttpClient):
                 "fupdate": 1,  # 更新标记
             },
         )
+        self._invalidate_post(post.uin, post.tid)
         return ApiResponse.from_raw(raw)
 
     async def comment(self, post: Post, content: str) -> ApiResponse:
@@ -168,6 +313,7 @@ class QzoneAPI(QzoneHttpClient):
                 "content": content,  # 评论内容
             },
         )
+        self._invalidate_post(post.uin, post.tid)
         return ApiResponse.from_raw(raw)
 
     async def reply(
@@ -216,6 +362,7 @@ class QzoneAPI(QzoneHttpClient):
                 "Origin": "https://user.qzone.qq.com",
             },
         )
+        self._invalidate_post(post.uin, post.tid)
         return ApiResponse.from_raw(raw)
 
     async def delete(self, tid: str) -> ApiResponse:
@@ -244,6 +391,7 @@ class QzoneAPI(QzoneHttpClient):
                 ),
             },
         )
+        self._invalidate_post(ctx.uin, tid)
         return ApiResponse.from_raw(raw)
 
     async def get_feeds(
@@ -262,6 +410,10 @@ class QzoneAPI(QzoneHttpClient):
             num (int): 要获取的说说数量。
         """
         ctx = await self.session.get_ctx()
+        key = ("feeds", str(target_id), pos, num)
+        if (cached := self.cache.get(key)) is not None:
+            return cached
+        gen = self.cache.generation
         raw = await self.request(
             "GET",
             self.LIST_URL,
@@ -280,13 +432,19 @@ class QzoneAPI(QzoneHttpClient):
                 "need_private_comment": 1,
             },
         )
-        return ApiResponse.from_raw(raw)
+        resp = ApiResponse.from_raw(raw)
+        self.cache.put(key, resp, gen)
+        return resp
 
     async def get_detail(self, post: Post) -> ApiResponse:
         """
         获取单条说说详情（含完整评论、转发、图片、视频等）
         """
         ctx = await self.session.get_ctx()
+        key = ("detail", str(post.uin), str(post.tid))
+        if (cached := self.cache.get(key)) is not None:
+            return cached
+        gen = self.cache.generation
         raw = await self.request(
             "GET",
             self.DETAIL_URL,
@@ -298,13 +456,19 @@ class QzoneAPI(QzoneHttpClient):
             },
         )
 
-        return ApiResponse.from_raw(raw)
+        resp = ApiResponse.from_raw(raw)
+        self.cache.put(key, resp, gen)
+        return resp
 
     async def get_recent_feeds(self, page: int = 1) -> ApiResponse:
         """
         获取自己的好友说说列表，返回已读与未读的说说列表
         """
         ctx = await self.session.get_ctx()
+        key = ("recent", ctx.uin, page)
+        if (cached := self.cache.get(key)) is not None:
+            return cached
+        gen = self.cache.generation
         raw = await self.request(
             "GET",
             self.ZONE_LIST_URL,
@@ -326,4 +490,6 @@ class QzoneAPI(QzoneHttpClient):
                 "outputhtmlfeed": 1,  # 输出HTML格式
             },
         )
-        return ApiResponse.from_raw(raw)
+        resp = ApiResponse.from_raw(raw)
+        self.cache.put(key, resp, gen)
+        return resp
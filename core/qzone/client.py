@@ -1,3 +1,5 @@
+import asyncio
+import functools
 from typing import Any
 
 import aiohttp
@@ -16,19 +18,46 @@ from .constants import (
     QZONE_MSG_PERMISSION_DENIED,
 )
 from .parser import QzoneParser
+from .retry import CircuitBreaker, RetryPolicy
 from .session import QzoneSession
+from .throttle import QzoneThrottle
+
+
+class ImageExpiredError(RuntimeError):
+    """图片已过期（ret=-100），重登后仍未恢复"""
 
 
 class QzoneHttpClient:
     def __init__(self, session: QzoneSession, config: PluginConfig):
         self.cfg = config
         self.session = session
-        self._session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self.cfg.timeout)
+        throttle = config.throttle
+        self.throttle = QzoneThrottle(
+            enabled=throttle.enabled,
+            read_rate=throttle.read_rate,
+            write_rate=throttle.write_rate,
+            burst=throttle.burst,
+            max_inflight=throttle.max_inflight,
+            endpoint_limits={
+                QzoneThrottle.UPLOAD_ENDPOINT: (
+                    throttle.upload_rate,
+                    throttle.upload_burst,
+                    throttle.upload_inflight,
+                ),
+            },
         )
+        self.retry_policy = RetryPolicy()
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._inflight_gets: dict[tuple, asyncio.Task] = {}
+        self.coalesced = 0
 
-    async def close(self):
-        await self._session.close()
+    @property
+    def _session(self) -> aiohttp.ClientSession:
+        return self.cfg.http.get(
+            "qzone",
+            timeout=aiohttp.ClientTimeout(total=self.cfg.timeout),
+            trust_env=False,
+        )
 
     async def request(
         self,
@@ -41,50 +70,191 @@ class QzoneHttpClient:
         timeout: int | None = None,
         retry: int = 0,
     ) -> dict[str, Any]:
-        ctx = await self.session.get_ctx()
-        async with self._session.request(
-            method,
+        """
+        发送请求并解析响应。
+        参数相同的并发 GET 合并为一次请求，调用方共享同一份（只读）解析结果。
+        """
+        if method.upper() != "GET" or data is not None or retry:
+            return await self._send(
+                method,
+                url,
+                params=params,
+                data=data,
+                headers=headers,
+                timeout=timeout,
+                retry=retry,
+            )
+
+        key = (
             url,
-            params=params,
-            data=data,
-            headers=headers or ctx.headers(),
-            cookies=ctx.cookies(),
-            timeout=timeout,
-        ) as resp:
-            text = await resp.text()
+            tuple(sorted((k, str(v)) for k, v in (params or {}).items())),
+            tuple(sorted((headers or {}).items())),
+        )
+        task = self._inflight_gets.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._send(method, url, params=params, headers=headers, timeout=timeout)
+            )
+            self._inflight_gets[key] = task
+            task.add_done_callback(functools.partial(self._forget_get, key))
+        else:
+            self.coalesced += 1
+        # shield：单个调用方被取消时不影响其他共享者
+        return await asyncio.shield(task)
+
+    def _forget_get(self, key: tuple, task: asyncio.Task) -> None:
+        if self._inflight_gets.get(key) is task:
+            del self._inflight_gets[key]
+        # 取回异常，避免所有调用方都已取消时出现 "never retrieved" 告警
+        if not task.cancelled():
+            task.exception()
+
+    def singleflight_stats(self) -> dict[str, int]:
+        return {"inflight": len(self._inflight_gets), "coalesced": self.coalesced}
+
+    def _breaker(self, endpoint: str) -> CircuitBreaker:
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = self._breakers[endpoint] = CircuitBreaker(endpoint)
+        return breaker
+
+    def breaker_stats(self) -> dict[str, Any]:
+        return {name: b.stats() for name, b in self._breakers.items()}
+
+    async def _exchange(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: dict[str, Any] | None,
+        data: dict[str, Any] | None,
+        headers: dict[str, str] | None,
+        timeout: int | None,
+    ) -> tuple[int, str]:
+        """一次 HTTP 往返，返回 (状态码, 响应文本)"""
+        ctx = await self.session.get_ctx()
+        async with (
+            self.throttle.slot(method, url),
+            self._session.request(
+                method,
+                url,
+                params=params,
+                data=data,
+                headers=headers or ctx.headers(),
+                cookies=ctx.cookies(),
+                timeout=timeout,
+            ) as resp,
+        ):
+            return resp.status, await resp.text()
+
+    async def _send_with_retry(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: dict[str, Any] | None,
+        data: dict[str, Any] | None,
+        headers: dict[str, str] | None,
+        timeout: int | None,
+    ) -> tuple[int, str]:
+        """
+        带熔断与退避重试的 HTTP 往返：
+        超时、断连、5xx/429 计为上游故障；只有幂等请求会重试
+        """
+        endpoint = QzoneThrottle.endpoint_name(url)
+        breaker = self._breaker(endpoint)
+        policy = self.retry_policy
+        can_retry = policy.is_idempotent(method, endpoint)
+        attempt = 0
+        while True:
+            attempt += 1
+            breaker.before_call()
+            try:
+                status, text = await self._exchange(
+                    method,
+                    url,
+                    params=params,
+                    data=data,
+                    headers=headers,
+                    timeout=timeout,
+                )
+            except Exception as e:
+                if not policy.is_retryable_error(e):
+                    breaker.release_probe()
+                    raise
+                breaker.record_failure()
+                if not can_retry or attempt >= policy.max_attempts:
+                    raise
+                reason = f"{type(e).__name__}: {e}"
+            except BaseException:
+                breaker.release_probe()
+                raise
+            else:
+                if not policy.is_retryable_status(status):
+                    breaker.record_success()
+                    return status, text
+                breaker.record_failure()
+                if not can_retry or attempt >= policy.max_attempts:
+                    return status, text
+                reason = f"HTTP {status}"
+
+            delay = policy.backoff(attempt)
+            logger.warning(
+                f"[{endpoint}] 第 {attempt} 次请求失败（{reason}），{delay:.2f} 秒后重试"
+            )
+            await asyncio.sleep(delay)
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: dict[str, Any] | None = None,
+        data: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: int | None = None,
+        retry: int = 0,
+    ) -> dict[str, Any]:
+        status, text = await self._send_with_retry(
+            method, url, params=params, data=data, headers=headers, timeout=timeout
+        )
 
         parsed = QzoneParser.parse_response(text)
         meta = parsed.get(QZONE_INTERNAL_META_KEY)
         if not isinstance(meta, dict):
             meta = {}
             parsed[QZONE_INTERNAL_META_KEY] = meta
-        meta[QZONE_INTERNAL_HTTP_STATUS_KEY] = resp.status
+        meta[QZONE_INTERNAL_HTTP_STATUS_KEY] = status
 
         # 仅在明确登录失效时触发重登
+        image_expired = parsed.get("data", {}).get("ret") == QZONE_CODE_IMAGE_EXPIRED
         if (
-            resp.status == HTTP_STATUS_UNAUTHORIZED
+            status == HTTP_STATUS_UNAUTHORIZED
             or parsed.get("code") == QZONE_CODE_LOGIN_EXPIRED
-            or parsed.get("data", {}).get("ret") == QZONE_CODE_IMAGE_EXPIRED
+            or image_expired
         ):
             if retry >= 2:
+                if image_expired:
+                    raise ImageExpiredError("图片已过期，重试失败")
                 raise RuntimeError("登录失效，重试失败")
 
             logger.warning("登录失效，重新登录中")
             await self.session.login()
-            return await self.request(
+            return await self._send(
                 method,
                 url,
                 params=params,
                 data=data,
                 headers=headers,
+                timeout=timeout,
                 retry=retry + 1,
             )
 
-        if resp.status == HTTP_STATUS_FORBIDDEN and parsed.get("code") in (
+        if status == HTTP_STATUS_FORBIDDEN and parsed.get("code") in (
             QZONE_CODE_UNKNOWN,
             None,
         ):
-            parsed["code"] = resp.status
+            parsed["code"] = status
             parsed["message"] = QZONE_MSG_PERMISSION_DENIED
 
         return parsed
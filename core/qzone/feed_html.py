@@ -0,0 +1,253 @@
+# feed_html.py
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+import bs4
+
+from astrbot.api import logger
+
+from ..model import Comment
+
+try:
+    import lxml.html as lxml_html
+except ImportError:  # lxml 为可选依赖，缺失时回退 bs4
+    lxml_html = None
+
+_EMOTION_PREFIX = "http://qzonestyle.gtimg.cn"
+"""表情图标的地址前缀，不计入配图"""
+
+
+@dataclass
+class FeedHtml:
+    """从 feeds3 单条 html 中提取出的字段"""
+
+    text: str = ""
+    rt_con: str = ""
+    images: list[str] = field(default_factory=list)
+    videos: list[str] = field(default_factory=list)
+    comments: list[Comment] = field(default_factory=list)
+
+
+def _build_comment(
+    data_uin: str,
+    comment_tid: str,
+    nickname: str,
+    content: str,
+    time_str: str,
+    parent_tid: str | None,
+) -> Comment:
+    return Comment(
+        uin=int(data_uin) if data_uin.isdigit() else 0,
+        nickname=nickname,
+        content=content,
+        create_time=0,
+        create_time_str=time_str,
+        tid=int(comment_tid) if comment_tid.isdigit() else 0,
+        parent_tid=int(parent_tid) if parent_tid and parent_tid.isdigit() else None,
+    )
+
+
+def _strip_nickname(rt_con: str) -> str:
+    # 分割掉昵称部分（从第一个冒号开始取内容）
+    if "：" in rt_con:
+        rt_con = rt_con.split("：", 1)[1].strip()
+    return rt_con
+
+
+class FeedHtmlExtractor(Protocol):
+    name: str
+
+    def extract(self, html: str) -> FeedHtml: ...
+
+
+# ============ bs4 后端（兜底） ==================
+
+
+class Bs4FeedExtractor:
+    """基于 BeautifulSoup(html.parser) 的提取器，纯 Python，较慢"""
+
+    name = "bs4"
+
+    def extract(self, html: str) -> FeedHtml:
+        soup = bs4.BeautifulSoup(html, "html.parser")
+        out = FeedHtml()
+
+        # 提取文字内容
+        text_div = soup.find("div", class_="f-info")
+        out.text = text_div.get_text(strip=True) if text_div else ""
+        # 提取转发内容
+        if txt_box := soup.select_one("div.txt-box"):
+            out.rt_con = _strip_nickname(txt_box.get_text(strip=True))
+        # 提取图片URL
+        if img_box := soup.find("div", class_="img-box"):
+            for img in img_box.find_all("img"):  # type: ignore
+                src = img.get("src")  # type: ignore
+                if src and not str(src).startswith(_EMOTION_PREFIX):
+                    out.images.append(src)
+        # TODO 临时视频处理办法（视频缩略图）
+        img_tag = soup.select_one("div.video-img img")
+        if img_tag and "src" in img_tag.attrs:
+            out.images.append(img_tag["src"])  # type: ignore
+        # 获取视频url
+        video_div = soup.select_one("div.img-box.f-video-wrap.play")
+        if video_div and "url3" in video_div.attrs:
+            out.videos.append(video_div["url3"])  # type: ignore
+
+        # 查找所有评论项（包括主评论和回复）
+        for item in soup.select("li.comments-item.bor3"):
+            content = ""
+            if content_div := item.select_one("div.comments-content"):
+                # 移除操作按钮（回复/删除）
+                for op in content_div.select("div.comments-op"):
+                    op.decompose()
+                content = content_div.get_text(" ", strip=True).split(":", 1)[-1]
+
+            # 提取评论时间（直接使用相对时间字符串）
+            time_span = item.select_one("span.state")
+            time_str = time_span.get_text(strip=True) if time_span else ""
+
+            # 检查是否是回复
+            parent_tid = None
+            if parent_div := item.find_parent("div", class_="mod-comments-sub"):
+                if parent_li := parent_div.find_parent("li", class_="comments-item"):
+                    parent_tid = str(parent_li.get("data-tid"))
+
+            out.comments.append(
+                _build_comment(
+                    str(item.get("data-uin", "")),
+                    str(item.get("data-tid", "")),
+                    str(item.get("data-nick", "")),
+                    content,
+                    time_str,
+                    parent_tid,
+                )
+            )
+        return out
+
+
+# ============ lxml 后端（默认） ==================
+
+
+def _has_class(*names: str) -> str:
+    """XPath 谓词：class 属性同时包含给定的全部类名"""
+    return " and ".join(
+        f"contains(concat(' ', normalize-space(@class), ' '), ' {n} ')" for n in names
+    )
+
+
+_SKIP_TEXT_TAGS = frozenset({"script", "style"})
+
+
+def _iter_text(el: Any, skip_op: bool = False) -> Iterator[str]:
+    """与 bs4 get_text 一致的文本遍历：跳过注释、脚本，可选跳过操作按钮"""
+    if el.text and el.tag not in _SKIP_TEXT_TAGS:
+        yield el.text
+    for child in el:
+        if isinstance(child.tag, str) and child.tag not in _SKIP_TEXT_TAGS:
+            if not (
+                skip_op
+                and child.tag == "div"
+                and "comments-op" in (child.get("class") or "").split()
+            ):
+                yield from _iter_text(child, skip_op)
+        if child.tail:
+            yield child.tail
+
+
+def _get_text(el: Any, sep: str = "", skip_op: bool = False) -> str:
+    return sep.join(s for t in _iter_text(el, skip_op) if (s := t.strip()))
+
+
+class LxmlFeedExtractor:
+    """基于 lxml(libxml2) 的提取器，C 实现，输出与 bs4 后端一致"""
+
+    name = "lxml"
+
+    _X_TEXT = f".//div[{_has_class('f-info')}]"
+    _X_TXT_BOX = f".//div[{_has_class('txt-box')}]"
+    _X_IMG_BOX = f".//div[{_has_class('img-box')}]"
+    _X_VIDEO_IMG = f".//div[{_has_class('video-img')}]//img"
+    _X_VIDEO = f".//div[{_has_class('img-box', 'f-video-wrap', 'play')}]"
+    _X_COMMENT = f".//li[{_has_class('comments-item', 'bor3')}]"
+    _X_CONTENT = f".//div[{_has_class('comments-content')}]"
+    _X_STATE = f".//span[{_has_class('state')}]"
+    _X_OP_STATE = f".//div[{_has_class('comments-op')}]//span[{_has_class('state')}]"
+    _X_PARENT = (
+        f"ancestor::div[{_has_class('mod-comments-sub')}][1]"
+        f"/ancestor::li[{_has_class('comments-item')}][1]"
+    )
+
+    def extract(self, html: str) -> FeedHtml:
+        root = lxml_html.fragment_fromstring(html, create_parent="div")  # type: ignore[union-attr]
+        out = FeedHtml()
+
+        if found := root.xpath(self._X_TEXT):
+            out.text = _get_text(found[0])
+        if found := root.xpath(self._X_TXT_BOX):
+            out.rt_con = _strip_nickname(_get_text(found[0]))
+        if found := root.xpath(self._X_IMG_BOX):
+            for img in found[0].iter("img"):
+                src = img.get("src")
+                if src and not src.startswith(_EMOTION_PREFIX):
+                    out.images.append(src)
+        if found := root.xpath(self._X_VIDEO_IMG):
+            if (src := found[0].get("src")) is not None:
+                out.images.append(src)
+        if found := root.xpath(self._X_VIDEO):
+            if (url := found[0].get("url3")) is not None:
+                out.videos.append(url)
+
+        for item in root.xpath(self._X_COMMENT):
+            content = ""
+            # 与 bs4 后端一致：评论正文里的操作按钮视为已删除，其中的时间不参与匹配
+            removed = []
+            if found := item.xpath(self._X_CONTENT):
+                content = _get_text(found[0], " ", skip_op=True).split(":", 1)[-1]
+                removed = found[0].xpath(self._X_OP_STATE)
+
+            time_str = ""
+            for state in item.xpath(self._X_STATE):
+                if state not in removed:
+                    time_str = _get_text(state)
+                    break
+
+            parent_tid = None
+            if found := item.xpath(self._X_PARENT):
+                parent_tid = str(found[0].get("data-tid"))
+
+            out.comments.append(
+                _build_comment(
+                    item.get("data-uin", ""),
+                    item.get("data-tid", ""),
+                    item.get("data-nick", ""),
+                    content,
+                    time_str,
+                    parent_tid,
+                )
+            )
+        return out
+
+
+# ============ 后端选择 ==================
+
+_bs4_extractor = Bs4FeedExtractor()
+_default_extractor: FeedHtmlExtractor = (
+    LxmlFeedExtractor() if lxml_html is not None else _bs4_extractor
+)
+
+
+def extract_feed_html(
+    html: str, extractor: FeedHtmlExtractor | None = None
+) -> FeedHtml:
+    """提取单条说说的 html 字段，快速后端出错时回退 bs4"""
+    extractor = extractor or _default_extractor
+    if extractor is _bs4_extractor:
+        return extractor.extract(html)
+    try:
+        return extractor.extract(html)
+    except Exception as e:
+        logger.warning(f"{extractor.name} 解析说说 HTML 失败，回退 bs4：{e}")
+        return _bs4_extractor.extract(html)
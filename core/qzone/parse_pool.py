@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncGenerator, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from astrbot.api import logger
+
+from ..model import Post
+from .parser import QzoneParser
+
+
+class FeedParsePool:
+    """
+    说说解析线程池
+
+    - 逐条把说说交给线程池解析，事件循环不再被整页解析阻塞
+    - 按原始顺序流式产出 Post，调用方取够数量即可提前结束
+    - lxml 解析期间会释放 GIL，多线程可真正并行
+    """
+
+    WINDOW_FACTOR = 2
+    """在途任务数 = 线程数 × 该系数"""
+
+    def __init__(self, workers: int):
+        self.workers = max(int(workers), 1)
+        self._executor: ThreadPoolExecutor | None = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="qzone-parse"
+            )
+        return self._executor
+
+    async def _stream(
+        self, fn: Callable[[Any], Post | None], items: list[Any]
+    ) -> AsyncGenerator[Post, None]:
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        window = self.workers * self.WINDOW_FACTOR
+        pending: deque[asyncio.Future] = deque()
+        try:
+            for item in items:
+                pending.append(loop.run_in_executor(executor, fn, item))
+                if len(pending) < window:
+                    continue
+                if post := await self._take(pending.popleft()):
+                    yield post
+            while pending:
+                if post := await self._take(pending.popleft()):
+                    yield post
+        finally:
+            # 调用方提前结束时丢弃尚未开始的任务
+            for fut in pending:
+                fut.cancel()
+
+    @staticmethod
+    async def _take(fut: asyncio.Future) -> Post | None:
+        try:
+            return await fut
+        except Exception as e:
+            logger.error(f"解析说说失败，已跳过：{e}")
+            return None
+
+    def iter_feeds(self, msglist: list[dict]) -> AsyncGenerator[Post, None]:
+        """流式解析说说列表"""
+        return self._stream(QzoneParser.parse_feed_item, msglist)
+
+    def iter_recent_feeds(self, data: dict) -> AsyncGenerator[Post, None]:
+        """流式解析最近说说列表（保留 appid=311 过滤）"""
+        return self._stream(
+            QzoneParser.parse_recent_feed_item, QzoneParser.recent_feed_items(data)
+        )
+
+    def close(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -2,9 +2,9 @@
 import datetime
 import json
 import re
+from collections import Counter
 from typing import Any
 
-import bs4
 import json5
 
 from astrbot.api import logger
@@ -17,6 +17,7 @@ from .constants import (
     QZONE_MSG_JSON_PARSE_ERROR,
     QZONE_MSG_NON_OBJECT_RESPONSE,
 )
+from .feed_html import FeedHtmlExtractor, extract_feed_html
 
 
 def _safe_cell(text: str, max_len: int = 30) -> str:
@@ -43,6 +44,64 @@ class QzoneParser:
     def _error_payload(message: str) -> dict[str, Any]:
         return {"code": QZONE_CODE_UNKNOWN, "message": message, "data": {}}
 
+    decode_stats: Counter[str] = Counter()
+    """各解码层级的命中次数（json / json_undefined / json5 / failed）"""
+
+    _JSONP_CALL = re.compile(r"[A-Za-z_$][\w$.]*\s*\(\s*$")
+    """JSONP 外壳：第一个 { 之前紧挨着 `回调名(`"""
+
+    @staticmethod
+    def _extract_json(text: str) -> str | None:
+        """
+        定位 JSON 片段（JSONP 外壳 / 裸 JSON），只做下标扫描
+        """
+        start = text.find("{")
+        if start == -1:
+            return None
+        # 只有不以 { 开头、且 { 前是 `标识符(` 时才按 JSONP 处理，
+        # 避免把正文里的 "callback" 字样（如 callbackUrl）误判为外壳
+        if start > 0 and QzoneParser._JSONP_CALL.search(text, 0, start):
+            close = text.rfind(")")
+            end = text.rfind("}", start, close) if close > start else -1
+        else:
+            end = text.rfind("}")
+        if end < start:
+            return None
+        return text[start : end + 1]
+
+    @staticmethod
+    def _decode_json(json_str: str) -> Any:
+        """
+        分层解码：
+        1. 标准 JSON（C 实现）
+        2. 替换 undefined 后再用标准 JSON
+        3. json5（纯 Python，兜底非标准写法）
+        """
+        stats = QzoneParser.decode_stats
+        try:
+            data = json.loads(json_str, strict=False)
+            stats["json"] += 1
+            return data
+        except ValueError:
+            pass
+
+        json_str = json_str.replace("undefined", "null")
+        try:
+            data = json.loads(json_str, strict=False)
+            stats["json_undefined"] += 1
+            return data
+        except ValueError:
+            pass
+
+        try:
+            data = json5.loads(json_str)
+        except ValueError:
+            stats["failed"] += 1
+            raise
+        stats["json5"] += 1
+        logger.debug(f"响应需 json5 兜底解析（累计 {stats['json5']} 次）")
+        return data
+
     @staticmethod
     def parse_response(text: str, *, debug: bool = False) -> dict[str, Any]:
         """
@@ -56,25 +115,14 @@ class QzoneParser:
             logger.warning("响应内容为空")
             return QzoneParser._error_payload(QZONE_MSG_EMPTY_RESPONSE)
 
-        if m := re.search(
-            r"callback\s*\(\s*([^{]*(\{.*\})[^)]*)\s*\)",
-            text,
-            re.I | re.S,
-        ):
-            json_str = m.group(2)
-        else:
-            start = text.find("{")
-            end = text.rfind("}")
-            if start == -1 or end == -1 or end < start:
-                logger.warning("响应内容缺少 JSON 片段")
-                return QzoneParser._error_payload(QZONE_MSG_INVALID_RESPONSE)
-            json_str = text[start : end + 1]
-
-        json_str = json_str.replace("undefined", "null").strip()
+        json_str = QzoneParser._extract_json(text)
+        if json_str is None:
+            logger.warning("响应内容缺少 JSON 片段")
+            return QzoneParser._error_payload(QZONE_MSG_INVALID_RESPONSE)
 
         try:
-            data = json5.loads(json_str)
-        except (ValueError, json.JSONDecodeError) as e:
+            data = QzoneParser._decode_json(json_str)
+        except ValueError as e:
             logger.error(f"JSON 解析错误: {e}")
             return QzoneParser._error_payload(QZONE_MSG_JSON_PARSE_ERROR)
 
@@ -191,187 +239,115 @@ class QzoneParser:
         return "\n".join(lines)
 
     @staticmethod
-    def parse_feeds(msglist: list[dict]) -> list[Post]:
-        """解析说说列表"""
-        try:
-            posts = []
-            for msg in msglist:
-                logger.debug(msg)
-                # 提取图片信息
-                image_urls = []
-                for img_data in msg.get("pic", []):
-                    for key in ("url2", "url3", "url1", "smallurl"):
-                        if raw := img_data.get(key):
-                            image_urls.append(raw)
-                            break
-                # 读取视频封面（按图片处理）
-                for video in msg.get("video") or []:
-                    video_image_url = video.get("url1") or video.get("pic_url")
-                    image_urls.append(video_image_url)
-                # 提取视频播放地址
-                video_urls = []
-                for video in msg.get("video") or []:
-                    url = video.get("url3")
-                    if url:
-                        video_urls.append(url)
-                # 提取转发内容
-                rt_con = msg.get("rt_con", {}).get("content", "")
-                # 提取评论
-                comments = Comment.build_list(msg.get("commentlist") or [])
-                # 构造Post对象
-                post = Post(
-                    tid=msg.get("tid", 0),
-                    uin=msg.get("uin", 0),
-                    name=msg.get("name", ""),
-                    avatar_url=msg.get("portrait"),
-                    gin=0,
-                    text=msg.get("content", "").strip(),
-                    images=image_urls,
-                    videos=video_urls,
-                    anon=False,
-                    status="approved",
-                    create_time=msg.get("created_time", 0),
-                    rt_con=rt_con,
-                    comments=comments,
-                    extra_text=msg.get("source_name"),
-                )
-                posts.append(post)
-
-            return posts
+    def parse_feed_item(msg: dict) -> Post:
+        """解析说说列表中的单条说说"""
+        logger.debug(msg)
+        # 提取图片信息
+        image_urls = []
+        for img_data in msg.get("pic", []):
+            for key in ("url2", "url3", "url1", "smallurl"):
+                if raw := img_data.get(key):
+                    image_urls.append(raw)
+                    break
+        # 读取视频封面（按图片处理）
+        for video in msg.get("video") or []:
+            video_image_url = video.get("url1") or video.get("pic_url")
+            image_urls.append(video_image_url)
+        # 提取视频播放地址
+        video_urls = []
+        for video in msg.get("video") or []:
+            url = video.get("url3")
+            if url:
+                video_urls.append(url)
+        # 提取转发内容
+        rt_con = msg.get("rt_con", {}).get("content", "")
+        # 提取评论
+        comments = Comment.build_list(msg.get("commentlist") or [])
+        # 构造Post对象
+        return Post(
+            tid=msg.get("tid", 0),
+            uin=msg.get("uin", 0),
+            name=msg.get("name", ""),
+            avatar_url=msg.get("portrait"),
+            gin=0,
+            text=msg.get("content", "").strip(),
+            images=image_urls,
+            videos=video_urls,
+            anon=False,
+            status="approved",
+            create_time=msg.get("created_time", 0),
+            rt_con=rt_con,
+            comments=comments,
+            extra_text=msg.get("source_name"),
+        )
 
-        except Exception as e:
-            logger.error(f"解析说说列表失败: {e}")
-            return []
+    @staticmethod
+    def parse_feeds(msglist: list[dict]) -> list[Post]:
+        """解析说说列表，单条解析失败时跳过该条（与 FeedParsePool 一致）"""
+        posts = []
+        for msg in msglist:
+            try:
+                posts.append(QzoneParser.parse_feed_item(msg))
+            except Exception as e:
+                logger.error(f"解析说说失败，已跳过：{e}")
+        return posts
 
     @staticmethod
-    def parse_recent_feeds(data: dict) -> list[Post]:
-        """解析最近说说列表"""
-        feeds: list = data.get("data", {}).get("data", {})
+    def recent_feed_items(data: dict) -> list[dict]:
+        """取出最近说说列表中的原始条目"""
         if not data:
             return []
+        return data.get("data", {}).get("data") or []
+
+    @staticmethod
+    def parse_recent_feed_item(
+        feed: dict, extractor: FeedHtmlExtractor | None = None
+    ) -> Post | None:
+        """解析最近说说列表中的单条动态，非说说或无效数据返回 None"""
+        if not feed:
+            return None
+        # 过滤广告类内容（appid=311）
+        appid = str(feed.get("appid", ""))
+        if appid != "311":
+            return None
+        uin = feed.get("uin", "")
+        tid = feed.get("key", "")
+        if not uin or not tid:
+            logger.error(f"无效的说说数据: target_qq={uin}, tid={tid}")
+            return None
+        create_time = feed.get("abstime", "")
+        nickname = feed.get("nickname", "")
+        html_content = feed.get("html", "")
+        if not html_content:
+            logger.error(f"说说内容为空: UIN={uin}, TID={tid}")
+            return None
+
+        fields = extract_feed_html(html_content, extractor)
+
+        # 构造Post对象
+        return Post(
+            tid=str(tid),
+            uin=int(uin),
+            name=str(nickname),
+            avatar_url=feed.get("pic"),
+            text=fields.text,
+            images=list(set(fields.images)),
+            videos=fields.videos,
+            create_time=create_time,
+            rt_con=fields.rt_con,
+            comments=fields.comments,
+        )
+
+    @staticmethod
+    def parse_recent_feeds(
+        data: dict, extractor: FeedHtmlExtractor | None = None
+    ) -> list[Post]:
+        """解析最近说说列表（extractor 为空时使用默认 HTML 后端）"""
         try:
             posts = []
-            for feed in feeds:
-                if not feed:
-                    continue
-                # 过滤广告类内容（appid=311）
-                appid = str(feed.get("appid", ""))
-                if appid != "311":
-                    continue
-                uin = feed.get("uin", "")
-                tid = feed.get("key", "")
-                if not uin or not tid:
-                    logger.error(f"无效的说说数据: target_qq={uin}, tid={tid}")
-                    continue
-                create_time = feed.get("abstime", "")
-                nickname = feed.get("nickname", "")
-                html_content = feed.get("html", "")
-                if not html_content:
-                    logger.error(f"说说内容为空: UIN={uin}, TID={tid}")
-                    continue
-
-                soup = bs4.BeautifulSoup(html_content, "html.parser")
-
-                # 提取文字内容
-                text_div = soup.find("div", class_="f-info")
-                text = text_div.get_text(strip=True) if text_div else ""
-                # 提取转发内容
-                rt_con = ""
-                txt_box = soup.select_one("div.txt-box")
-                if txt_box:
-                    # 获取除昵称外的纯文本内容
-                    rt_con = txt_box.get_text(strip=True)
-                    # 分割掉昵称部分（从第一个冒号开始取内容）
-                    if "：" in rt_con:
-                        rt_con = rt_con.split("：", 1)[1].strip()
-                # 提取图片URL
-                image_urls = []
-                # 查找所有图片容器
-                if img_box := soup.find("div", class_="img-box"):
-                    for img in img_box.find_all("img"):  # type: ignore
-                        src = img.get("src")  # type: ignore
-                        if src and not str(src).startswith(
-                            "http://qzonestyle.gtimg.cn"
-                        ):  # 过滤表情图标
-                            image_urls.append(src)
-                # TODO 临时视频处理办法（视频缩略图）
-                img_tag = soup.select_one("div.video-img img")
-                if img_tag and "src" in img_tag.attrs:
-                    image_urls.append(img_tag["src"])
-                # 获取视频url
-                videos = []
-                video_div = soup.select_one("div.img-box.f-video-wrap.play")
-                if video_div and "url3" in video_div.attrs:
-                    videos.append(video_div["url3"])
-                # 获取评论内容
-                comments: list[Comment] = []
-                # 查找所有评论项（包括主评论和回复）
-                comment_items = soup.select("li.comments-item.bor3")
-                if comment_items:
-                    for item in comment_items:
-                        # 提取基本信息
-                        data_uin = str(item.get("data-uin", ""))
-                        comment_tid = str(item.get("data-tid", ""))
-                        nickname = str(item.get("data-nick", ""))
-
-                        # 查找评论内容
-                        content_div = item.select_one("div.comments-content")
-                        if content_div:
-                            # 移除操作按钮（回复/删除）
-                            for op in content_div.select("div.comments-op"):
-                                op.decompose()
-                            # 获取纯文本内容
-                            content = content_div.get_text(" ", strip=True).split(
-                                ":", 1
-                            )[-1]
-                        else:
-                            content = ""
-
-                        # 提取评论时间（直接使用相对时间字符串）
-                        comment_time_span = item.select_one("span.state")
-                        comment_time = (
-                            comment_time_span.get_text(strip=True)
-                            if comment_time_span
-                            else ""
-                        )
-
-                        # 检查是否是回复
-                        parent_tid = None
-                        parent_div = item.find_parent("div", class_="mod-comments-sub")
-                        if parent_div:
-                            parent_li = parent_div.find_parent(
-                                "li", class_="comments-item"
-                            )
-                            if parent_li:
-                                parent_tid = str(parent_li.get("data-tid"))  # type: ignore
-
-                        comments.append(
-                            Comment(
-                                uin=int(data_uin) if data_uin.isdigit() else 0,
-                                nickname=nickname,
-                                content=content,
-                                create_time=0,
-                                create_time_str=comment_time,
-                                tid=int(comment_tid) if comment_tid.isdigit() else 0,
-                                parent_tid=int(parent_tid)
-                                if parent_tid and parent_tid.isdigit()
-                                else None,
-                            )
-                        )
-                # 构造Post对象
-                post = Post(
-                    tid=str(tid),
-                    uin=int(uin),
-                    name=str(nickname),
-                    avatar_url=feed.get("pic"),
-                    text=text,
-                    images=list(set(image_urls)),
-                    videos=videos,
-                    create_time=create_time,
-                    rt_con=rt_con,
-                    comments=comments,
-                )
-                posts.append(post)
+            for feed in QzoneParser.recent_feed_items(data):
+                if post := QzoneParser.parse_recent_feed_item(feed, extractor):
+                    posts.append(post)
 
             logger.info(f"成功解析 {len(posts)} 条最新说说")
             return posts
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any
+
+from .model import ApiResponse
+
+
+class ResponseCache:
+    """
+    读接口响应缓存（TTL + LRU）
+
+    - key 为元组，首元素是接口类别（feeds / detail / recent / visitor），决定 TTL
+    - 只缓存成功响应，缓存对象供多个调用方共享，只读
+    - 写操作后按前缀失效；失效会推进 generation，
+      失效前已发出的读请求返回后不再写入缓存，避免写后读到旧数据
+    """
+
+    TTLS: dict[str, float] = {
+        "feeds": 30,
+        "detail": 30,
+        "recent": 15,
+        "visitor": 60,
+    }
+    """各类接口的缓存时间（秒）"""
+    MAX_ENTRIES = 256
+    """缓存条目上限"""
+
+    def __init__(
+        self,
+        ttls: dict[str, float] | None = None,
+        max_entries: int = MAX_ENTRIES,
+    ):
+        self.ttls = {**self.TTLS, **(ttls or {})}
+        self.max_entries = max_entries
+        self.generation = 0
+        self._entries: OrderedDict[tuple, tuple[float, ApiResponse]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> ApiResponse | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires, resp = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return resp
+
+    def put(self, key: tuple, resp: ApiResponse, generation: int) -> None:
+        if not resp.ok or generation != self.generation:
+            return
+        ttl = self.ttls.get(key[0], 0)
+        if ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, resp)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, *prefix: Any) -> None:
+        """删除以 prefix 开头的全部条目；不传参数则清空"""
+        self.generation += 1
+        n = len(prefix)
+        for key in [k for k in self._entries if k[:n] == prefix]:
+            del self._entries[key]
+
+    def stats(self) -> dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
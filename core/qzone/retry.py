@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from typing import Any
+
+import aiohttp
+
+
+class CircuitOpenError(RuntimeError):
+    """熔断期间直接拒绝请求"""
+
+
+class RetryPolicy:
+    """
+    重试策略：指数退避 + 全抖动
+
+    - 只重试幂等请求：GET，以及重复提交无副作用的写接口（点赞）
+    - 只重试瞬时故障：超时、连接断开、5xx / 429
+    """
+
+    MAX_ATTEMPTS = 3
+    """最多尝试次数（含首次）"""
+    BASE_DELAY = 0.5
+    """首次重试的退避上限（秒），之后每次翻倍"""
+    MAX_DELAY = 8.0
+    """单次退避上限（秒）"""
+    IDEMPOTENT_POSTS = frozenset({"internal_dolike_app"})
+    """可安全重试的 POST 接口（按 URL 路径最后一段）"""
+
+    RETRYABLE_ERRORS: tuple[type[BaseException], ...] = (
+        asyncio.TimeoutError,
+        aiohttp.ClientConnectionError,
+        aiohttp.ClientPayloadError,
+    )
+
+    def __init__(
+        self,
+        max_attempts: int = MAX_ATTEMPTS,
+        base_delay: float = BASE_DELAY,
+        max_delay: float = MAX_DELAY,
+    ):
+        self.max_attempts = max(int(max_attempts), 1)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def is_idempotent(self, method: str, endpoint: str) -> bool:
+        return method.upper() == "GET" or endpoint in self.IDEMPOTENT_POSTS
+
+    @staticmethod
+    def is_retryable_status(status: int) -> bool:
+        return status == 429 or status >= 500
+
+    def is_retryable_error(self, exc: BaseException) -> bool:
+        return isinstance(exc, self.RETRYABLE_ERRORS)
+
+    def backoff(self, attempt: int) -> float:
+        """第 attempt 次失败后的等待时间（attempt 从 1 开始）"""
+        cap = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, cap)
+
+
+class CircuitBreaker:
+    """
+    单个接口的熔断器
+
+    - closed：正常放行，连续失败达到阈值后进入 open
+    - open：冷却期内直接失败，不再占用连接与调度时间
+    - half-open：冷却结束后只放行一个探测请求，成功则恢复，失败则重新冷却
+    """
+
+    FAILURE_THRESHOLD = 5
+    """连续失败多少次后熔断"""
+    COOLDOWN = 30.0
+    """熔断冷却时间（秒）"""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        cooldown: float = COOLDOWN,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.rejected = 0
+
+    def before_call(self) -> None:
+        if self.state == "closed":
+            return
+        if self.state == "open":
+            remain = self._opened_at + self.cooldown - time.monotonic()
+            if remain > 0:
+                self.rejected += 1
+                raise CircuitOpenError(
+                    f"接口 {self.name} 连续失败已熔断，{remain:.0f} 秒后重试"
+                )
+            self.state = "half-open"
+        # half-open：只放行一个探测请求
+        if self._probing:
+            self.rejected += 1
+            raise CircuitOpenError(f"接口 {self.name} 正在探测恢复，请稍后重试")
+        self._probing = True
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.state == "half-open" or self.failures >= self.failure_threshold:
+            self.state = "open"
+            self._opened_at = time.monotonic()
+
+    def release_probe(self) -> None:
+        """探测请求既未成功也未失败（如被取消）时归还探测名额"""
+        self._probing = False
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import time
+from collections.abc import Iterator
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any
+from urllib.parse import urlsplit
+
+PRIORITY_INTERACTIVE = 0
+"""交互优先级：用户指令、管理面板"""
+PRIORITY_BACKGROUND = 1
+"""后台优先级：定时任务、概率触发"""
+
+_priority: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "qzone_priority", default=PRIORITY_INTERACTIVE
+)
+
+
+@contextmanager
+def background_priority() -> Iterator[None]:
+    """在此上下文（及其派生的 Task）中发出的请求按后台优先级排队"""
+    token = _priority.set(PRIORITY_BACKGROUND)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class EndpointLimiter:
+    """
+    单个接口的限流器
+
+    - 令牌桶：平均速率 rate（次/秒），允许突发 burst 次
+    - 在途上限：同时进行的请求数不超过 max_inflight
+    - 等待队列按 (优先级, 到达顺序) 出队，交互请求先于后台请求
+    """
+
+    def __init__(self, name: str, rate: float, burst: int, max_inflight: int):
+        self.name = name
+        self.rate = max(float(rate), 0.01)
+        self.burst = max(int(burst), 1)
+        self.max_inflight = max(int(max_inflight), 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._inflight = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        # 统计
+        self.granted = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _dispatch(self) -> None:
+        """尽可能把令牌与在途名额分给队首等待者"""
+        self._timer = None
+        self._refill()
+        while self._waiters and self._inflight < self.max_inflight:
+            if self._tokens < 1:
+                delay = (1 - self._tokens) / self.rate
+                loop = asyncio.get_running_loop()
+                self._timer = loop.call_later(delay, self._dispatch)
+                return
+            _, _, fut = heapq.heappop(self._waiters)
+            if fut.done():  # 已取消
+                continue
+            self._tokens -= 1
+            self._inflight += 1
+            fut.set_result(None)
+
+    async def acquire(self, priority: int) -> None:
+        self._refill()
+        if (
+            not self._waiters
+            and self._tokens >= 1
+            and self._inflight < self.max_inflight
+        ):
+            self._tokens -= 1
+            self._inflight += 1
+            self.granted += 1
+            return
+
+        self.throttled += 1
+        start = time.monotonic()
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), fut))
+        if self._timer is None:
+            self._dispatch()
+        try:
+            await fut
+        except asyncio.CancelledError:
+            # 已分到名额但调用方被取消，归还名额
+            if fut.done() and not fut.cancelled():
+                self.release()
+            else:
+                fut.cancel()
+            raise
+        self.granted += 1
+        self.wait_seconds += time.monotonic() - start
+
+    def release(self) -> None:
+        self._inflight -= 1
+        if self._waiters and self._timer is None:
+            self._dispatch()
+
+    def stats(self) -> dict[str, Any]:
+        self._refill()
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "max_inflight": self.max_inflight,
+            "inflight": self._inflight,
+            "waiting": sum(1 for *_, f in self._waiters if not f.done()),
+            "tokens": round(self._tokens, 2),
+            "granted": self.granted,
+            "throttled": self.throttled,
+            "wait_seconds": round(self.wait_seconds, 3),
+        }
+
+
+class QzoneThrottle:
+    """
+    按接口区分的限流与并发治理
+
+    接口名取 URL 路径最后一段（如 emotion_cgi_msgdetail_v6），
+    读接口（GET）与写接口（POST）使用不同的速率配置，
+    endpoint_limits 中的接口（如上传图片）使用各自的配置。
+    """
+
+    UPLOAD_ENDPOINT = "cgi_upload_image"
+    """上传图片接口名"""
+    ENDPOINT_LIMITS: dict[str, tuple[float, int, int]] = {
+        # 一次发说说最多 9 张图，由 QzoneAPI.UPLOAD_CONCURRENCY 控制并发；
+        # 按写接口的 1 次/秒限速，9 张图至少要多等 4 秒
+        UPLOAD_ENDPOINT: (4.0, 9, 4),
+    }
+    """单独限速接口的默认配置：接口名 → (速率, 突发数, 最大并发)"""
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = True,
+        read_rate: float = 5.0,
+        write_rate: float = 1.0,
+        burst: int = 5,
+        max_inflight: int = 4,
+        endpoint_limits: dict[str, tuple[float, int, int]] | None = None,
+    ):
+        self.enabled = enabled
+        self.read_rate = read_rate
+        self.write_rate = write_rate
+        self.burst = burst
+        self.max_inflight = max_inflight
+        self.endpoint_limits = {**self.ENDPOINT_LIMITS, **(endpoint_limits or {})}
+        self._limiters: dict[str, EndpointLimiter] = {}
+
+    @staticmethod
+    def endpoint_name(url: str) -> str:
+        return urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1] or url
+
+    def _limiter(self, method: str, url: str) -> EndpointLimiter:
+        name = self.endpoint_name(url)
+        limiter = self._limiters.get(name)
+        if limiter is None:
+            if name in self.endpoint_limits:
+                limiter = EndpointLimiter(name, *self.endpoint_limits[name])
+            else:
+                rate = self.read_rate if method.upper() == "GET" else self.write_rate
+                limiter = EndpointLimiter(name, rate, self.burst, self.max_inflight)
+            self._limiters[name] = limiter
+        return limiter
+
+    @asynccontextmanager
+    async def slot(self, method: str, url: str):
+        """占用一个请求名额，优先级取自当前上下文"""
+        if not self.enabled:
+            yield
+            return
+        limiter = self._limiter(method, url)
+        await limiter.acquire(_priority.get())
+        try:
+            yield
+        finally:
+            limiter.release()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "endpoints": {
+                name: limiter.stats() for name, limiter in self._limiters.items()
+            },
+        }
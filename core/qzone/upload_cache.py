@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+import uuid
+from collections.abc import Iterable
+from pathlib import Path
+
+from astrbot.api import logger
+
+
+class UploadCache:
+    """
+    已上传图片缓存：(账号 uin, 图片内容哈希) → (picbo, richval)
+
+    - 同一张图片再次发布（重新过稿、重复转发、失败重发）时直接复用，跳过上传
+    - 持久化到插件数据目录的 JSON 文件，超过 TTL 或超出容量的条目被丢弃
+    - 复用的图片被 QQ 空间判定过期时，由调用方 invalidate 后重新上传
+    """
+
+    TTL = 7 * 24 * 3600
+    """条目有效期（秒）"""
+    MAX_ENTRIES = 1000
+    """条目上限，超出时淘汰最早写入的"""
+
+    def __init__(self, path: Path, *, ttl: int = TTL, max_entries: int = MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: dict[str, tuple[str, str, float]] | None = None
+        self._dirty = False
+
+    @staticmethod
+    def key_of(image: bytes, uin: int | str) -> str:
+        """上传结果只对上传它的账号有效，键里带上 uin"""
+        return f"{uin}:{hashlib.blake2b(image, digest_size=20).hexdigest()}"
+
+    def _load(self) -> dict[str, tuple[str, str, float]]:
+        if self._entries is not None:
+            return self._entries
+        self._entries = {}
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+            now = time.time()
+            for key, (picbo, richval, ts) in raw.items():
+                if now - ts < self.ttl:
+                    self._entries[key] = (picbo, richval, ts)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"图片上传缓存损坏，已忽略：{e}")
+        return self._entries
+
+    def get(self, key: str) -> tuple[str, str] | None:
+        entry = self._load().get(key)
+        if entry is None:
+            return None
+        picbo, richval, ts = entry
+        if time.time() - ts >= self.ttl:
+            self.invalidate([key])
+            return None
+        return picbo, richval
+
+    def put(self, key: str, value: tuple[str, str]) -> None:
+        entries = self._load()
+        entries.pop(key, None)
+        entries[key] = (*value, time.time())
+        while len(entries) > self.max_entries:
+            del entries[next(iter(entries))]
+        self._dirty = True
+
+    def invalidate(self, keys: Iterable[str]) -> None:
+        entries = self._load()
+        for key in keys:
+            if entries.pop(key, None) is not None:
+                self._dirty = True
+
+    def _save(self, snapshot: dict[str, tuple[str, str, float]]) -> None:
+        tmp = self.path.with_name(f"{self.path.stem}.{uuid.uuid4().hex}.tmp")
+        try:
+            tmp.write_text(json.dumps(snapshot), encoding="utf-8")
+            os.replace(tmp, self.path)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    async def flush(self) -> None:
+        """有变更时落盘（先写临时文件再原子替换）"""
+        if not self._dirty or self._entries is None:
+            return
+        self._dirty = False
+        try:
+            await asyncio.to_thread(self._save, dict(self._entries))
+        except Exception as e:
+            logger.warning(f"保存图片上传缓存失败：{e}")
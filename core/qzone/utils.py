@@ -1,43 +1,117 @@
-from collections.abc import Sequence
+import io
 from typing import Union
 
 import aiohttp
+from PIL import Image, ImageOps
 
 from astrbot.api import logger
 
 BytesOrStr = Union[str, bytes]  # noqa: UP007
 
 
-async def download_file(url: str) -> bytes | None:
-    """下载图片"""
+async def download_file(url: str, session: aiohttp.ClientSession) -> bytes | None:
+    """下载图片（复用调用方传入的会话）"""
     url = url.replace("https://", "http://")
     try:
-        async with aiohttp.ClientSession() as client:
-            response = await client.get(url)
+        async with session.get(url) as response:
             img_bytes = await response.read()
             return img_bytes
     except Exception as e:
         logger.error(f"图片下载失败: {e}")
 
 
-async def normalize_images(images: Sequence[BytesOrStr] | None) -> list[bytes]:
+async def load_image(item: BytesOrStr, session: aiohttp.ClientSession) -> bytes | None:
     """
-    将 str/bytes 混合列表统一转成 bytes 列表：
-    - str -> 下载后转 bytes（下载失败则忽略）
-    - bytes -> 原样保留
-    - None -> 空列表
+    单张图片转 bytes：
+    - str -> 下载后转 bytes（下载失败返回 None）
+    - bytes -> 原样返回
     """
-    if images is None:
-        return []
-
-    cleaned: list[bytes] = []
-    for item in images:
-        if isinstance(item, bytes):
-            cleaned.append(item)
-        elif isinstance(item, str):
-            file = await download_file(item)
-            if file is not None:
-                cleaned.append(file)
-        else:
-            raise TypeError(f"image 必须是 str 或 bytes，收到 {type(item)}")
-    return cleaned
+    if isinstance(item, bytes):
+        return item
+    if isinstance(item, str):
+        return await download_file(item, session)
+    raise TypeError(f"image 必须是 str 或 bytes，收到 {type(item)}")
+
+
+_JPEG_METADATA_MARKERS = frozenset({0xE1, 0xED})
+"""上传前去掉的 JPEG 段：APP1（EXIF / XMP，含 GPS）、APP13（IPTC）"""
+_EXIF_ORIENTATION = 0x0112
+
+
+def strip_jpeg_metadata(image: bytes) -> bytes | None:
+    """
+    无损去掉 JPEG 中的 EXIF / XMP / IPTC 段，其余字节（含 ICC 色彩配置）原样保留。
+    不是合法的 JPEG 时返回 None。
+    """
+    if image[:2] != b"\xff\xd8":
+        return None
+    out = bytearray(image[:2])
+    pos, size = 2, len(image)
+    while pos + 4 <= size:
+        if image[pos] != 0xFF:
+            return None
+        marker = image[pos + 1]
+        if marker == 0xFF:  # 填充字节
+            pos += 1
+            continue
+        if marker == 0xDA:  # SOS 之后是压缩数据，原样拷贝
+            out += image[pos:]
+            return bytes(out)
+        length = int.from_bytes(image[pos + 2 : pos + 4], "big")
+        end = pos + 2 + length
+        if length < 2 or end > size:
+            return None
+        if marker not in _JPEG_METADATA_MARKERS:
+            out += image[pos:end]
+        pos = end
+    return None
+
+
+def compress_image(
+    image: bytes,
+    *,
+    max_side: int = 2048,
+    quality: int = 85,
+    min_bytes: int = 512 * 1024,
+) -> bytes:
+    """
+    上传前压缩图片（同步、CPU 密集，应在线程中调用）：
+    - 长边超过 max_side 时等比缩小
+    - 重新编码为 JPEG，去除 EXIF 等元数据（先按 EXIF 方向摆正）
+    - 小于 min_bytes、无需缩放且无需摆正的 JPEG 不重新编码，只去掉 EXIF / IPTC 段
+    - 其他格式中小于 min_bytes 且无需缩放的图片、动图原样返回
+    - 压缩结果反而更大时返回（去掉元数据的）原图
+    """
+    try:
+        with Image.open(io.BytesIO(image)) as img:
+            if getattr(img, "is_animated", False):
+                return image
+            too_large = max(img.size) > max_side > 0
+            rotated = img.getexif().get(_EXIF_ORIENTATION, 1) != 1
+            # 不能无损去掉元数据的 JPEG（结构异常或需要摆正）必须重新编码
+            original = image
+            if img.format == "JPEG":
+                original = None if rotated else strip_jpeg_metadata(image)
+            if original is not None and not too_large and len(image) < min_bytes:
+                return original
+
+            img = ImageOps.exif_transpose(img)
+            if too_large:
+                img.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+            if img.mode in ("RGBA", "LA", "P"):
+                rgba = img.convert("RGBA")
+                img = Image.new("RGB", rgba.size, (255, 255, 255))
+                img.paste(rgba, mask=rgba.getchannel("A"))
+            elif img.mode != "RGB":
+                img = img.convert("RGB")
+
+            buf = io.BytesIO()
+            img.save(buf, "JPEG", quality=quality, optimize=True, progressive=True)
+    except Exception as e:
+        logger.warning(f"图片压缩失败，使用原图：{e}")
+        return image
+
+    out = buf.getvalue()
+    if original is not None and len(out) >= len(original) and not too_large:
+        return original
+    return out
@@ -3,11 +3,15 @@ from __future__ import annotations
 import asyncio
 from pathlib import Path
 
+from astrbot.api import logger
+
 from ..config import PluginConfig
 from ..model import Post
 from .parser_card_data import Author, ParseResult, Platform
 from .parser_card_renderer import Renderer as ParserCardRenderer
 from .post_adapter import QzonePostCardAdapter
+from .render_cache import RenderCache
+from .render_pool import CardRenderPool
 from .resource_fetcher import ResourceFetcher
 
 
@@ -17,6 +21,12 @@ class BuiltinQzoneCardRenderer:
         self.fetcher = ResourceFetcher(config)
         self.adapter = QzonePostCardAdapter(self.fetcher)
         self.renderer = ParserCardRenderer(config)
+        self.pool = (
+            CardRenderPool(config, config.render_workers)
+            if config.render_workers
+            else None
+        )
+        self.cache = RenderCache(config.temp_dir / "render_cache")
         self._resources_loaded = False
 
     async def _ensure_resources_loaded(self) -> None:
@@ -25,10 +35,47 @@ class BuiltinQzoneCardRenderer:
         await asyncio.to_thread(ParserCardRenderer.load_resources)
         self._resources_loaded = True
 
+    def prefetch_post(self, post: Post) -> None:
+        self.adapter.prefetch(post)
+
+    def _cache_key(self, result: ParseResult) -> str:
+        return RenderCache.make_key(
+            "builtin",
+            ParserCardRenderer.RENDER_VERSION,
+            ParserCardRenderer.DEFAULT_FONT_PATH.name,
+            self.cfg.emoji_style,
+            result.get_resource_id(),
+        )
+
+    async def _render_png(self, result: ParseResult) -> bytes:
+        """有进程池则在子进程渲染，失败时回退到本进程"""
+        if self.pool is not None:
+            try:
+                return await self.pool.render(result)
+            except Exception as exc:
+                logger.warning(f"进程池渲染失败，回退到本进程渲染：{exc}")
+        return await self.renderer.render_png(result)
+
+    async def _render(self, result: ParseResult) -> Path | None:
+        """相同输入直接复用缓存图片，否则渲染后写入缓存，失败返回 None"""
+        key = self._cache_key(result)
+        if cached := self.cache.get(key):
+            return cached
+        try:
+            data = await self._render_png(result)
+            return await self.cache.put(key, data)
+        except Exception:
+            logger.error(f"Failed to render card for result={result}")
+            return None
+
+    async def close(self) -> None:
+        if self.pool is not None:
+            self.pool.close()
+
     async def render_post(self, post: Post) -> Path | None:
         await self._ensure_resources_loaded()
         result = await self.adapter.to_parse_result(post)
-        return await self.renderer.render_card(result)
+        return await self._render(result)
 
     async def render_text(self, text: str) -> Path | None:
         if not text.strip():
@@ -40,4 +87,4 @@ class BuiltinQzoneCardRenderer:
             author=Author(name="系统消息"),
             text=text,
         )
-        return await self.renderer.render_card(result)
+        return await self._render(result)
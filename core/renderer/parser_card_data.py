@@ -309,13 +309,21 @@ class ParseResult:
         add(self.platform.name)
         add(self.url)
         add(self.timestamp)
+        add(self.title)
+        add(self.text)
+        add(self.extra_info)
         if self.author:
             add(self.author.name)
+            if isinstance(self.author.avatar, Path):
+                add(self.author.avatar.name)
 
         # ---------- 内容结构 ----------
         add(len(self.contents))
         for cont in self.contents:
             add(cont.__class__.__name__)
+            # 已落盘的资源按文件名区分（缓存文件名由 URL 摘要生成）
+            if isinstance(cont.path_task, Path):
+                add(cont.path_task.name)
 
             # 子类补充（仍然是 O(1)）
             if isinstance(cont, VideoContent):
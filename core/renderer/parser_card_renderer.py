@@ -1,5 +1,4 @@
 import asyncio
-import uuid
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from functools import lru_cache, wraps
@@ -7,7 +6,6 @@ from io import BytesIO
 from pathlib import Path
 from typing import ClassVar, ParamSpec, TypeVar
 
-import aiofiles
 from apilmoji import Apilmoji, EmojiCDNSource
 from apilmoji.core import get_font_height
 from PIL import Image, ImageDraw, ImageFont
@@ -246,6 +244,9 @@ class RenderContext:
 class Renderer:
     """统一的渲染器，将解析结果转换为消息"""
 
+    RENDER_VERSION = 1
+    """渲染版本，修改排版后递增以使旧的渲染缓存失效"""
+
     # 卡片配置常量
     PADDING = 25
     """内边距"""
@@ -460,22 +461,12 @@ class Renderer:
         await self._draw_sections(ctx, sections)
         return image
 
-    async def render_card(self, result: ParseResult) -> Path | None:
-        """渲染卡片并落盘，失败返回 None"""
-        cache = self.cfg.temp_dir / f"card_{uuid.uuid4().hex}.png"
-        try:
-            img = await self._create_card_image(result)
-            buf = BytesIO()
-            await asyncio.to_thread(img.save, buf, format="PNG")
-
-            async with aiofiles.open(cache, "wb") as fp:
-                await fp.write(buf.getvalue())
-            return cache
-        except Exception:
-            logger.error(
-                f"Failed to render card for result={result}",
-            )
-            return None
+    async def render_png(self, result: ParseResult) -> bytes:
+        """渲染卡片，返回 PNG 字节"""
+        img = await self._create_card_image(result)
+        buf = BytesIO()
+        await asyncio.to_thread(img.save, buf, format="PNG")
+        return buf.getvalue()
 
     @suppress_exception
     def _load_and_resize_cover(
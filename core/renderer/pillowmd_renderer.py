@@ -6,12 +6,14 @@ from astrbot.api import logger
 
 from ..config import PluginConfig
 from ..model import Post
+from .render_cache import RenderCache
 
 
 class PillowmdMessageRenderer:
     def __init__(self, config: PluginConfig):
         self.cfg = config
         self.style = None
+        self.cache = RenderCache(config.temp_dir / "render_cache")
         self._load_renderer()
 
     def _load_renderer(self) -> None:
@@ -22,16 +24,26 @@ class PillowmdMessageRenderer:
         except Exception as exc:
             logger.error(f"无法加载 pillowmd 样式：{exc}")
 
-    async def render_post(self, post: Post) -> Path | None:
-        if not self.style:
-            return None
+    def prefetch_post(self, post: Post) -> None:
+        """pillowmd 直接按 URL 渲染，无需预取"""
+        return None
 
-        img = await self.style.AioRender(text=post.to_str(), useImageUrl=True)
-        return img.Save(self.cfg.temp_dir)
+    async def close(self) -> None:
+        return None
 
-    async def render_text(self, text: str) -> Path | None:
+    async def _render(self, text: str) -> Path | None:
         if not self.style:
             return None
 
+        key = RenderCache.make_key("pillowmd", self.cfg.style_dir, text)
+        if cached := self.cache.get(key):
+            return cached
         img = await self.style.AioRender(text=text, useImageUrl=True)
-        return img.Save(self.cfg.temp_dir)
+        saved = img.Save(self.cfg.temp_dir)
+        return self.cache.adopt(key, Path(saved)) if saved else None
+
+    async def render_post(self, post: Post) -> Path | None:
+        return await self._render(post.to_str())
+
+    async def render_text(self, text: str) -> Path | None:
+        return await self._render(text)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from pathlib import Path
 
 from ..model import Post, extract_and_replace_nickname, remove_em_tags
@@ -15,12 +16,39 @@ from .resource_fetcher import ResourceFetcher
 
 class QzonePostCardAdapter:
     PLATFORM = Platform(name="qzone", display_name="QQ空间")
+    FETCH_CONCURRENCY = 4
+    """同时下载的资源数上限"""
+    MAX_PREFETCH = 64
+    """最多保留的预取任务数"""
 
     def __init__(self, fetcher: ResourceFetcher):
         self.fetcher = fetcher
+        self._semaphore = asyncio.Semaphore(self.FETCH_CONCURRENCY)
+        self._prefetching: dict[
+            str, asyncio.Task[tuple[Path | None, list[ImageContent]]]
+        ] = {}
+
+    @staticmethod
+    def _resource_key(post: Post) -> str:
+        return "\n".join((str(post.uin), post.avatar_url or "", *post.images))
+
+    def prefetch(self, post: Post) -> None:
+        """提前在后台下载头像与图片，供稍后的 to_parse_result 直接复用"""
+        key = self._resource_key(post)
+        if key in self._prefetching:
+            return
+        self._prefetching[key] = asyncio.create_task(self._resolve_resources(post))
+        while len(self._prefetching) > self.MAX_PREFETCH:
+            stale = self._prefetching.pop(next(iter(self._prefetching)))
+            if not stale.done():
+                stale.cancel()
 
     async def to_parse_result(self, post: Post) -> ParseResult:
-        avatar_path = await self._resolve_avatar(post)
+        task = self._prefetching.pop(self._resource_key(post), None)
+        if task is not None and not task.cancelled():
+            avatar_path, contents = await task
+        else:
+            avatar_path, contents = await self._resolve_resources(post)
         result = ParseResult(
             platform=self.PLATFORM,
             author=Author(
@@ -29,7 +57,7 @@ class QzonePostCardAdapter:
             ),
             timestamp=post.create_time,
             text=remove_em_tags(post.text),
-            contents=await self._resolve_contents(post),
+            contents=list(contents),
             comments=self._build_comments(post),
             extra=self._build_extra(post),
         )
@@ -41,7 +69,21 @@ class QzonePostCardAdapter:
             )
         return result
 
+    async def _resolve_resources(
+        self, post: Post
+    ) -> tuple[Path | None, list[ImageContent]]:
+        """并发下载头像与全部图片，图片顺序与 post.images 一致"""
+        avatar_path, contents = await asyncio.gather(
+            self._resolve_avatar(post),
+            self._resolve_contents(post),
+        )
+        return avatar_path, contents
+
     async def _resolve_avatar(self, post: Post) -> Path | None:
+        async with self._semaphore:
+            return await self._download_avatar(post)
+
+    async def _download_avatar(self, post: Post) -> Path | None:
         if post.avatar_url:
             avatar_path = await self.fetcher.fetch_url_to_cache(
                 post.avatar_url,
@@ -56,16 +98,18 @@ class QzonePostCardAdapter:
         return None
 
     async def _resolve_contents(self, post: Post) -> list[ImageContent]:
-        images: list[ImageContent] = []
-        for index, url in enumerate(post.images):
-            path = await self.fetcher.fetch_url_to_cache(
-                url,
-                prefix=f"image_{index}",
-                suffix=".jpg",
-            )
-            if path is not None:
-                images.append(ImageContent(path))
-        return images
+        async def fetch(index: int, url: str) -> Path | None:
+            async with self._semaphore:
+                return await self.fetcher.fetch_url_to_cache(
+                    url,
+                    prefix=f"image_{index}",
+                    suffix=".jpg",
+                )
+
+        paths = await asyncio.gather(
+            *(fetch(index, url) for index, url in enumerate(post.images))
+        )
+        return [ImageContent(path) for path in paths if path is not None]
 
     def _build_extra(self, post: Post) -> dict[str, str]:
         infos: list[str] = []
@@ -10,3 +10,7 @@ class MessageRenderer(Protocol):
     async def render_post(self, post: Post) -> Path | None: ...
 
     async def render_text(self, text: str) -> Path | None: ...
+
+    def prefetch_post(self, post: Post) -> None: ...
+
+    async def close(self) -> None: ...
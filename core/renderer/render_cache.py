@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+import uuid
+from pathlib import Path
+
+import aiofiles
+
+from astrbot.api import logger
+
+
+class RenderCache:
+    """
+    按渲染输入指纹缓存卡片图片
+
+    - 相同输入（稿件内容 + 渲染器版本 + 主题）直接复用已落盘的图片
+    - 超过 max_age 的文件过期；总大小超过 max_bytes 时按最近使用时间淘汰
+    """
+
+    MAX_BYTES = 64 * 1024 * 1024
+    """缓存目录总大小上限（字节）"""
+    MAX_AGE = 24 * 3600
+    """单个文件的最长保留时间（秒）"""
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        *,
+        max_bytes: int = MAX_BYTES,
+        max_age: int = MAX_AGE,
+    ):
+        self.cache_dir = cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+    @staticmethod
+    def make_key(*parts: object) -> str:
+        h = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            h.update(str(part).encode("utf-8"))
+            h.update(b"|")
+        return h.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"card_{key}.png"
+
+    def get(self, key: str) -> Path | None:
+        """命中则刷新使用时间并返回路径"""
+        path = self._path(key)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        now = time.time()
+        if now - stat.st_mtime > self.max_age:
+            path.unlink(missing_ok=True)
+            return None
+        os.utime(path, (now, stat.st_mtime))
+        return path
+
+    async def put(self, key: str, data: bytes) -> Path:
+        """写入缓存（唯一临时文件 + 原子替换，同一 key 并发写入互不干扰）"""
+        path = self._path(key)
+        tmp = path.with_name(f"{path.stem}.{uuid.uuid4().hex}.tmp")
+        try:
+            async with aiofiles.open(tmp, "wb") as fp:
+                await fp.write(data)
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+        self.evict()
+        return path
+
+    def adopt(self, key: str, src: Path) -> Path:
+        """把渲染器自行落盘的文件移入缓存"""
+        path = self._path(key)
+        os.replace(src, path)
+        self.evict()
+        return path
+
+    def evict(self) -> None:
+        """清理过期文件，并在超出容量时淘汰最久未使用的文件"""
+        now = time.time()
+        entries: list[tuple[float, int, Path]] = []
+        for path in self.cache_dir.glob("card_*.png"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if now - stat.st_mtime > self.max_age:
+                path.unlink(missing_ok=True)
+                continue
+            entries.append((stat.st_atime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink(missing_ok=True)
+                total -= size
+            except OSError as e:
+                logger.debug(f"清理渲染缓存失败：{path.name} -> {e}")
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from types import SimpleNamespace
+
+from astrbot.api import logger
+
+from ..config import PluginConfig
+from .parser_card_data import ParseResult, TextContent, VideoContent
+from .parser_card_renderer import Renderer
+
+# ============ 子进程侧 ==================
+
+_worker_renderer: Renderer | None = None
+_worker_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _init_worker(emoji_cdn: str, emoji_style: str, temp_dir: str) -> None:
+    """子进程初始化：字体、按钮、LOGO 只加载一次"""
+    global _worker_renderer, _worker_loop
+    Renderer.load_resources()
+    settings = SimpleNamespace(
+        emoji_cdn=emoji_cdn,
+        emoji_style=emoji_style,
+        temp_dir=Path(temp_dir),
+    )
+    _worker_renderer = Renderer(settings)  # type: ignore[arg-type]
+    _worker_loop = asyncio.new_event_loop()
+
+
+def _render_in_worker(result: ParseResult) -> bytes:
+    if _worker_renderer is None or _worker_loop is None:
+        raise RuntimeError("渲染进程未初始化")
+    return _worker_loop.run_until_complete(_worker_renderer.render_png(result))
+
+
+# ============ 主进程侧 ==================
+
+
+async def _resolve_paths(result: ParseResult) -> None:
+    """把所有 Task 形式的路径等待成 Path，使 ParseResult 可以被 pickle"""
+    if result.author:
+        await result.author.get_avatar_path()
+    for cont in result.contents:
+        if isinstance(cont, TextContent):
+            continue
+        await cont.get_path()
+        if isinstance(cont, VideoContent):
+            await cont.get_cover_path()
+    if result.repost:
+        await _resolve_paths(result.repost)
+
+
+class CardRenderPool:
+    """
+    进程池渲染引擎
+
+    把 PIL 排版、缩放、圆角与 emoji 合成移出事件循环，
+    输入为路径已就绪的 ParseResult，输出 PNG 字节。
+    """
+
+    def __init__(self, config: PluginConfig, workers: int):
+        self.cfg = config
+        self.workers = max(int(workers), 1)
+        self._executor: ProcessPoolExecutor | None = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn：避免 fork 带走宿主进程的事件循环与线程
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(
+                    self.cfg.emoji_cdn,
+                    self.cfg.emoji_style,
+                    str(self.cfg.temp_dir),
+                ),
+            )
+        return self._executor
+
+    async def render(self, result: ParseResult) -> bytes:
+        await _resolve_paths(result)
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self._get_executor(), _render_in_worker, result
+            )
+        except BrokenProcessPool:
+            # 子进程崩溃后进程池不可再用，下次调用时重建
+            self.close()
+            raise
+
+    def close(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        try:
+            executor.shutdown(wait=False, cancel_futures=True)
+        except Exception as e:
+            logger.debug(f"关闭渲染进程池时忽略异常：{e}")
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import asyncio
 import hashlib
-import socket
 from pathlib import Path
 
 import aiofiles
@@ -21,30 +20,26 @@ def _avatar_urls(user_id: str) -> list[str]:
     ]
 
 
-async def get_avatar(user_id: str) -> bytes | None:
-    """获取头像"""
-    timeout = aiohttp.ClientTimeout(total=25, connect=10, sock_connect=10, sock_read=20)
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/136.0.0.0 Safari/537.36"
-        ),
-        "Accept": "image/avif,image/webp,image/apng,image/*,*/*;q=0.8",
-    }
+_AVATAR_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/136.0.0.0 Safari/537.36"
+    ),
+    "Accept": "image/avif,image/webp,image/apng,image/*,*/*;q=0.8",
+}
+_AVATAR_TIMEOUT = aiohttp.ClientTimeout(
+    total=25, connect=10, sock_connect=10, sock_read=20
+)
 
+
+async def get_avatar(user_id: str, session: aiohttp.ClientSession) -> bytes | None:
+    """获取头像（复用调用方传入的会话）"""
     for avatar_url in _avatar_urls(user_id):
         try:
-            connector = aiohttp.TCPConnector(family=socket.AF_INET, ttl_dns_cache=300)
-            async with aiohttp.ClientSession(
-                timeout=timeout,
-                connector=connector,
-                headers=headers,
-                trust_env=True,
-            ) as session:
-                async with session.get(avatar_url, allow_redirects=True) as response:
-                    response.raise_for_status()
-                    return await response.read()
+            async with session.get(avatar_url, allow_redirects=True) as response:
+                response.raise_for_status()
+                return await response.read()
         except Exception as exc:
             logger.warning(f"头像下载重试候选失败: {avatar_url} -> {exc}")
 
@@ -52,7 +47,7 @@ async def get_avatar(user_id: str) -> bytes | None:
         async with httpx.AsyncClient(
             timeout=25,
             follow_redirects=True,
-            headers=headers,
+            headers=_AVATAR_HEADERS,
             trust_env=True,
         ) as client:
             for avatar_url in _avatar_urls(user_id):
@@ -110,7 +105,10 @@ class ResourceFetcher:
         if cache_path.exists():
             return cache_path
 
-        content = await get_avatar(user_id_str)
+        session = self.cfg.http.get(
+            "avatar", timeout=_AVATAR_TIMEOUT, headers=_AVATAR_HEADERS, trust_env=True
+        )
+        content = await get_avatar(user_id_str, session)
         if content is None:
             return None
 
@@ -146,23 +144,22 @@ class ResourceFetcher:
         logger.error(f"下载资源失败: {url} -> {' | '.join(errors)}")
         return None
 
-    async def _download_with_aiohttp(self, url: str) -> bytes:
+    def _resource_session(self) -> aiohttp.ClientSession:
         timeout = aiohttp.ClientTimeout(
             total=max(self.cfg.timeout, 25),
             connect=min(max(self.cfg.timeout, 10), 15),
             sock_connect=min(max(self.cfg.timeout, 10), 15),
             sock_read=max(self.cfg.timeout, 20),
         )
-        connector = aiohttp.TCPConnector(family=socket.AF_INET, ttl_dns_cache=300)
-        async with aiohttp.ClientSession(
-            timeout=timeout,
-            connector=connector,
-            headers=self._headers,
-            trust_env=True,
-        ) as session:
-            async with session.get(url, allow_redirects=True) as response:
-                response.raise_for_status()
-                return await response.read()
+        return self.cfg.http.get(
+            "resource", timeout=timeout, headers=self._headers, trust_env=True
+        )
+
+    async def _download_with_aiohttp(self, url: str) -> bytes:
+        session = self._resource_session()
+        async with session.get(url, allow_redirects=True) as response:
+            response.raise_for_status()
+            return await response.read()
 
     async def _download_with_httpx(self, url: str) -> bytes:
         async with httpx.AsyncClient(
@@ -9,6 +9,7 @@ from apscheduler.triggers.date import DateTrigger
 from astrbot.api import logger
 
 from .config import PluginConfig
+from .qzone.throttle import background_priority
 from .sender import Sender
 from .service import PostService
 
@@ -101,7 +102,8 @@ class AutoRandomCronTask:
     async def _run_task_wrapper(self):
         logger.info(f"[{self.job_name}] 开始执行任务")
         try:
-            await self.do_task()
+            with background_priority():
+                await self.do_task()
         except Exception as e:
             logger.exception(f"[{self.job_name}] 任务执行失败: {e}")
         finally:
@@ -146,6 +148,8 @@ class AutoComment(AutoRandomCronTask):
             no_self=True,
             no_commented=True,
         )
+        for post in posts:
+            self.sender.prefetch_post(post)
         for post in posts:
             try:
                 await self.service.comment_posts(post)
@@ -18,6 +18,16 @@ class Sender:
         self.cfg = config
         self.renderer = create_message_renderer(config)
 
+    async def close(self) -> None:
+        await self.renderer.close()
+
+    def prefetch_post(self, post: Post) -> None:
+        """提前下载渲染所需的图片资源，与评论生成等耗时操作并行"""
+        try:
+            self.renderer.prefetch_post(post)
+        except Exception as e:
+            logger.debug(f"预取渲染资源失败：{e}")
+
     async def _post_to_seg(self, post: Post) -> BaseMessageComponent:
         image_path = await self.renderer.render_post(post)
         if image_path:
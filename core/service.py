@@ -1,3 +1,4 @@
+import asyncio
 import time
 from typing import Any
 
@@ -6,6 +7,7 @@ from astrbot.core.platform.sources.aiocqhttp.aiocqhttp_message_event import (
     AiocqhttpMessageEvent,
 )
 
+from .config import PluginConfig
 from .db import PostDB
 from .llm_action import LLMAction
 from .model import Comment, Post
@@ -24,6 +26,7 @@ from .qzone.constants import (
     QZONE_MSG_NON_OBJECT_RESPONSE,
     QZONE_MSG_PERMISSION_DENIED,
 )
+from .qzone.parse_pool import FeedParsePool
 
 
 class PostService:
@@ -33,15 +36,24 @@ class PostService:
 
     def __init__(
         self,
+        config: PluginConfig,
         qzone: QzoneAPI,
         session: QzoneSession,
         db: PostDB,
         llm: LLMAction,
     ):
+        self.cfg = config
         self.qzone = qzone
         self.session = session
         self.db = db
         self.llm = llm
+        self.parse_pool = (
+            FeedParsePool(config.parse_workers) if config.parse_workers > 0 else None
+        )
+
+    def close(self) -> None:
+        if self.parse_pool is not None:
+            self.parse_pool.close()
 
     # ============================================================
     # 业务接口
@@ -65,15 +77,16 @@ class PostService:
             if not msglist:
                 logger.info(f"QQ {target_id} 暂无可见说说（非错误，返回空列表）")
                 return []
-            posts: list[Post] = QzoneParser.parse_feeds(msglist)
+            posts: list[Post] = await self._parse_feeds(msglist)
 
         else:
             resp = await self.qzone.get_recent_feeds()
             if not resp.ok:
                 raise RuntimeError(self._map_feed_error(resp))
-            posts: list[Post] = QzoneParser.parse_recent_feeds(resp.data)[
-                pos : pos + num
-            ]
+            posts: list[Post] = await self._parse_recent_feeds(
+                resp.data, limit=pos + num
+            )
+            posts = posts[pos : pos + num]
             if not posts:
                 raise RuntimeError("动态流暂无可见说说")
 
@@ -89,11 +102,30 @@ class PostService:
         if no_commented:
             posts = await self._filter_not_commented(posts)
 
-        for post in posts:
-            await self.db.save(post)
+        await self.db.save_many(posts)
 
         return posts
 
+    async def _parse_feeds(self, msglist: list[dict]) -> list[Post]:
+        if self.parse_pool is None:
+            return QzoneParser.parse_feeds(msglist)
+        return [post async for post in self.parse_pool.iter_feeds(msglist)]
+
+    async def _parse_recent_feeds(self, data: dict, *, limit: int) -> list[Post]:
+        """解析动态流，线程池模式下取够 limit 条即停止"""
+        if self.parse_pool is None:
+            return QzoneParser.parse_recent_feeds(data)
+        posts: list[Post] = []
+        stream = self.parse_pool.iter_recent_feeds(data)
+        try:
+            async for post in stream:
+                posts.append(post)
+                if len(posts) >= limit:
+                    break
+        finally:
+            await stream.aclose()
+        return posts
+
     @staticmethod
     def _contains_any(text: str, keywords: tuple[str, ...]) -> bool:
         return any(k in text for k in keywords)
@@ -159,53 +191,61 @@ class PostService:
     def _has_comment_from_uin(post: Post, uin: int) -> bool:
         return any(comment.uin == uin for comment in post.comments)
 
-    async def _has_saved_self_comment(self, post: Post, uin: int) -> bool:
-        if not post.tid:
-            return False
-        saved_post = await self.db.get(post.tid, key="tid")
-        return bool(saved_post and self._has_comment_from_uin(saved_post, uin))
-
     async def _fill_post_detail(self, posts: list[Post]) -> list[Post]:
-        result: list[Post] = []
+        details = await self._fetch_details(posts)
+        return [post for post in details if post is not None]
 
-        for post in posts:
+    async def _fetch_detail(self, post: Post) -> Post | None:
+        """拉取并解析单条说说详情，失败返回 None"""
+        try:
             resp = await self.qzone.get_detail(post)
-            if not resp.ok or not resp.data:
-                logger.warning(f"获取详情失败：{resp.data}")
-                continue
+        except Exception as e:
+            logger.warning(f"获取详情失败：tid={post.tid}, error={e}")
+            return None
+        if not resp.ok or not resp.data:
+            logger.warning(f"获取详情失败：{resp.data}")
+            return None
+        parsed = QzoneParser.parse_feeds([resp.data])
+        if not parsed:
+            logger.warning(f"解析详情失败：{resp.data}")
+            return None
+        return parsed[0]
 
-            parsed = QzoneParser.parse_feeds([resp.data])
-            if not parsed:
-                logger.warning(f"解析详情失败：{resp.data}")
-                continue
+    async def _fetch_details(self, posts: list[Post]) -> list[Post | None]:
+        """并发拉取详情（受 detail_concurrency 限制），结果与输入一一对应"""
+        if not posts:
+            return []
+        semaphore = asyncio.Semaphore(max(int(self.cfg.detail_concurrency or 1), 1))
 
-            result.append(parsed[0])
+        async def fetch(post: Post) -> Post | None:
+            async with semaphore:
+                return await self._fetch_detail(post)
 
-        return result
+        return list(await asyncio.gather(*(fetch(post) for post in posts)))
 
     async def _filter_not_commented(self, posts: list[Post]) -> list[Post]:
-        result: list[Post] = []
         uin = await self.session.get_uin()
 
-        for post in posts:
-            if self._has_comment_from_uin(post, uin):
-                continue
-            if await self._has_saved_self_comment(post, uin):
-                continue
+        # 1. 内存中已有自己的评论
+        posts = [p for p in posts if not self._has_comment_from_uin(p, uin)]
+
+        # 2. 数据库里记录过自己的评论（一次 IN 查询）
+        commented = await self.db.commented_tids([p.tid for p in posts if p.tid], uin)
+        posts = [p for p in posts if p.tid not in commented]
 
-            # 如果已经有 comments，说明是 detail post
+        # 3. 没有 comments 的不是 detail post，并发补拉详情
+        pending = [p for p in posts if not p.comments]
+        details = dict(zip(map(id, pending), await self._fetch_details(pending)))
+
+        result: list[Post] = []
+        for post in posts:
             if not post.comments:
-                resp = await self.qzone.get_detail(post)
-                if not resp.ok or not resp.data:
-                    continue
-                parsed = QzoneParser.parse_feeds([resp.data])
-                if not parsed:
+                detail = details[id(post)]
+                if detail is None:
                     continue
-                post = parsed[0]
-
+                post = detail
             if self._has_comment_from_uin(post, uin):
                 continue
-
             result.append(post)
 
         return result
@@ -243,17 +283,16 @@ class PostService:
 
         uin = await self.session.get_uin()
         name = await self.session.get_nickname()
-        post.comments.append(
-            Comment(
-                uin=uin,
-                nickname=name,
-                content=content,
-                create_time=int(time.time()),
-                tid=0,
-                parent_tid=None,
-            )
+        comment = Comment(
+            uin=uin,
+            nickname=name,
+            content=content,
+            create_time=int(time.time()),
+            tid=0,
+            parent_tid=None,
         )
-        await self.db.save(post)
+        post.comments.append(comment)
+        await self.db.add_comment(post, comment)
         logger.info(f"评论 → {post.name}")
 
     async def reply_comment(
@@ -294,16 +333,15 @@ class PostService:
 
         # 本地回填
         name = await self.session.get_nickname()
-        post.comments.append(
-            Comment(
-                uin=uin,
-                nickname=name,
-                content=content,
-                create_time=int(time.time()),
-                parent_tid=comment.tid,
-            )
+        reply = Comment(
+            uin=uin,
+            nickname=name,
+            content=content,
+            create_time=int(time.time()),
+            parent_tid=comment.tid,
         )
-        await self.db.save(post)
+        post.comments.append(reply)
+        await self.db.add_comment(post, reply)
 
     async def publish_post(
         self,
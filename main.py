@@ -13,8 +13,11 @@ from .core.campus_wall import CampusWall
 from .core.config import PluginConfig
 from .core.db import PostDB
 from .core.llm_action import LLMAction
+from .core.media_store import MediaStore
 from .core.model import Comment, Post
+from .core.post_refs import PostRefStore
 from .core.qzone import QzoneAPI, QzoneParser, QzoneSession
+from .core.qzone.throttle import background_priority
 from .core.scheduler import AutoComment, AutoPublish
 from .core.sender import Sender
 from .core.service import PostService
@@ -45,14 +48,18 @@ class QzonePlugin(Star):
         # 消息发送器
         self.sender = Sender(self.cfg)
         # 操作服务
-        self.service = PostService(self.qzone, self.session, self.db, self.llm)
+        self.service = PostService(
+            self.cfg, self.qzone, self.session, self.db, self.llm
+        )
         # 表白墙
         self.campus_wall = CampusWall(self.cfg, self.service, self.db, self.sender)
         # 自动评论模块
         self.auto_comment: AutoComment | None = None
         # 自动发说说模块
         self.auto_publish: AutoPublish | None = None
-        self._page_post_refs: dict[str, Post] = {}
+        self._page_post_refs = PostRefStore()
+        # 面板上传媒体暂存区
+        self.media_store = MediaStore(self.cfg.temp_dir / "media")
         self._register_page_web_apis()
 
     async def initialize(self):
@@ -154,13 +161,16 @@ class QzonePlugin(Star):
                     "feed": 10,
                     "images": 9,
                 },
+                "throttle": self.qzone.throttle.stats(),
+                "singleflight": self.qzone.singleflight_stats(),
+                "cache": self.qzone.cache.stats(),
+                "breakers": self.qzone.breaker_stats(),
+                "decode": dict(QzoneParser.decode_stats),
             },
         }
 
     def _remember_page_post(self, post: Post) -> str:
-        post_id = f"{post.uin}:{post.tid}"
-        self._page_post_refs[post_id] = post
-        return post_id
+        return self._page_post_refs.put(post)
 
     def _capture_page_client(self):
         if self.cfg.client is not None:
@@ -224,11 +234,18 @@ class QzonePlugin(Star):
             ]
         return payload
 
-    def _require_page_post(self, post_id: str) -> Post:
-        post = self._page_post_refs.get(str(post_id or "").strip())
-        if not post:
-            raise RuntimeError("说说引用已失效，请刷新页面后重试")
-        return post
+    async def _require_page_post(self, post_id: str) -> Post:
+        post_id = str(post_id or "").strip()
+        if post := self._page_post_refs.get(post_id):
+            return post
+        # 引用已被淘汰时按 uin:tid 回查数据库
+        uin, _, tid = post_id.partition(":")
+        if uin and tid:
+            post = await self.db.get(tid, key="tid")
+            if post and str(post.uin) == uin:
+                self._page_post_refs.put(post)
+                return post
+        raise RuntimeError("说说引用已失效，请刷新页面后重试")
 
     async def page_status(self):
         return await self._page_json(self._build_page_status)
@@ -272,7 +289,7 @@ class QzonePlugin(Star):
         async def handler():
             self._capture_page_client()
             params = await self._page_query_params()
-            post = self._require_page_post(params.get("id", ""))
+            post = await self._require_page_post(params.get("id", ""))
             resp = await self.qzone.get_detail(post)
             if not resp.ok or not resp.data:
                 raise RuntimeError(resp.message or "获取详情失败")
@@ -298,16 +315,23 @@ class QzonePlugin(Star):
             body = await self._page_json_body()
             media = body.get("media") or []
             images = []
+            media_ids = []
             for item in media:
                 if not isinstance(item, dict):
                     continue
                 source = str(item.get("source") or "")
-                if source.startswith("base64://"):
+                if source.startswith(MediaStore.SCHEME):
+                    media_id = source.removeprefix(MediaStore.SCHEME)
+                    images.append(await self.media_store.read(media_id))
+                    media_ids.append(media_id)
+                elif source.startswith("base64://"):
                     images.append(base64.b64decode(source.removeprefix("base64://")))
             post = await self.service.publish_post(
                 text=str(body.get("content") or ""),
                 images=images,
             )
+            for media_id in media_ids:
+                self.media_store.discard(media_id)
             return {
                 "ok": True,
                 "data": {"post": self._page_post_payload(post)},
@@ -320,7 +344,7 @@ class QzonePlugin(Star):
         async def handler():
             self._capture_page_client()
             body = await self._page_json_body()
-            post = self._require_page_post(body.get("id", ""))
+            post = await self._require_page_post(body.get("id", ""))
             resp = await self.qzone.like(post)
             if not resp.ok:
                 raise RuntimeError(resp.message or "点赞失败")
@@ -332,7 +356,7 @@ class QzonePlugin(Star):
         async def handler():
             self._capture_page_client()
             body = await self._page_json_body()
-            post = self._require_page_post(body.get("id", ""))
+            post = await self._require_page_post(body.get("id", ""))
             content = str(body.get("content") or "").strip()
             if not content:
                 raise RuntimeError("评论内容不能为空")
@@ -366,7 +390,7 @@ class QzonePlugin(Star):
         async def handler():
             self._capture_page_client()
             body = await self._page_json_body()
-            post = self._require_page_post(body.get("id", ""))
+            post = await self._require_page_post(body.get("id", ""))
             content = str(body.get("content") or "").strip()
             comment_id = str(body.get("commentid") or "")
             if not content:
@@ -406,7 +430,7 @@ class QzonePlugin(Star):
         async def handler():
             self._capture_page_client()
             body = await self._page_json_body()
-            post = self._require_page_post(body.get("id", ""))
+            post = await self._require_page_post(body.get("id", ""))
             self_uin = await self.session.get_uin()
             if int(post.uin) != int(self_uin):
                 raise RuntimeError("只能删除自己发布的说说")
@@ -421,19 +445,19 @@ class QzonePlugin(Star):
         async def handler():
             if _quart_request is None:
                 raise RuntimeError("当前环境不支持上传")
-            files = await _quart_request.files
-            upload = files.get("file") or files.get("image") or files.get("media")
-            if upload is None:
-                raise RuntimeError("没有收到图片文件")
-            data = await upload.read()
+            # 边接收边落盘暂存（超过上限立即中止），只把 media id 返回给浏览器
+            media_id, upload, size = await self.media_store.receive(
+                _quart_request, ("file", "image", "media")
+            )
             return {
                 "ok": True,
                 "data": {
                     "media": {
+                        "id": media_id,
                         "kind": "image",
                         "name": upload.filename or "image.jpg",
-                        "source": f"base64://{base64.b64encode(data).decode('ascii')}",
-                        "size": len(data),
+                        "source": f"{MediaStore.SCHEME}{media_id}",
+                        "size": size,
                         "mime_type": getattr(upload, "content_type", "")
                         or "image/jpeg",
                     }
@@ -444,12 +468,15 @@ class QzonePlugin(Star):
 
     async def terminate(self):
         """插件卸载时"""
-        if self.qzone:
-            await self.qzone.close()
         if self.auto_comment:
             await self.auto_comment.terminate()
         if self.auto_publish:
             await self.auto_publish.terminate()
+        self.service.close()
+        if self.db:
+            await self.db.close()
+        await self.sender.close()
+        await self.cfg.http.close()
 
     @filter.platform_adapter_type(filter.PlatformAdapterType.AIOCQHTTP)
     async def prob_read_feed(self, event: AiocqhttpMessageEvent):
@@ -465,22 +492,27 @@ class QzonePlugin(Star):
             and random.random() < self.cfg.trigger.read_prob
         ):
             target_id = event.get_sender_id()
-            posts = await self.service.query_feeds(
-                target_id=target_id, pos=0, num=1, no_self=True, no_commented=True
-            )
-            for post in posts:
-                try:
-                    await self.service.comment_posts(post, event=event)
-                    if self.cfg.trigger.like_when_comment:
-                        await self.service.like_posts(post)
-                    await self.sender.send_post(
-                        event,
-                        post,
-                        message="触发读说说",
-                        send_admin=self.cfg.trigger.send_admin,
-                    )
-                except Exception as e:
-                    logger.error(e)
+            with background_priority():
+                await self._prob_comment(event, target_id)
+
+    async def _prob_comment(self, event: AiocqhttpMessageEvent, target_id: str):
+        posts = await self.service.query_feeds(
+            target_id=target_id, pos=0, num=1, no_self=True, no_commented=True
+        )
+        for post in posts:
+            self.sender.prefetch_post(post)
+            try:
+                await self.service.comment_posts(post, event=event)
+                if self.cfg.trigger.like_when_comment:
+                    await self.service.like_posts(post)
+                await self.sender.send_post(
+                    event,
+                    post,
+                    message="触发读说说",
+                    send_admin=self.cfg.trigger.send_admin,
+                )
+            except Exception as e:
+                logger.error(e)
 
     @filter.permission_type(filter.PermissionType.ADMIN)
     @filter.command("查看访客")
@@ -544,6 +576,8 @@ class QzonePlugin(Star):
     async def comment_feed(self, event: AiocqhttpMessageEvent):
         """评说说 <序号/范围>"""
         posts = await self._get_posts(event, no_commented=True, no_self=True)
+        for post in posts:
+            self.sender.prefetch_post(post)
         for post in posts:
             try:
                 await self.service.comment_posts(post, event=event)
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# 插件目录本身不是可安装的包，测试时把仓库根目录加入导入路径
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,63 @@
+import io
+
+import pytest
+from PIL import ExifTags, Image
+
+from core.qzone.utils import compress_image, strip_jpeg_metadata
+
+
+def make_jpeg(size=(64, 32), orientation: int = 1, icc: bytes | None = None) -> bytes:
+    exif = Image.Exif()
+    exif[ExifTags.Base.Make] = "TestCam"
+    exif[ExifTags.Base.Orientation] = orientation
+    exif[ExifTags.IFD.GPSInfo] = {
+        ExifTags.GPS.GPSLatitudeRef: "N",
+        ExifTags.GPS.GPSLatitude: (31.0, 14.0, 5.5),
+        ExifTags.GPS.GPSLongitudeRef: "E",
+        ExifTags.GPS.GPSLongitude: (121.0, 28.0, 12.0),
+    }
+    buf = io.BytesIO()
+    extra = {"icc_profile": icc} if icc else {}
+    Image.new("RGB", size, (200, 80, 40)).save(
+        buf, "JPEG", quality=90, exif=exif, **extra
+    )
+    return buf.getvalue()
+
+
+def open_exif(data: bytes) -> Image.Exif:
+    with Image.open(io.BytesIO(data)) as img:
+        return img.getexif()
+
+
+@pytest.mark.parametrize("min_kb", [512, 0])
+def test_small_jpeg_loses_gps_exif(min_kb):
+    src = make_jpeg()
+    assert open_exif(src).get_ifd(ExifTags.IFD.GPSInfo)
+
+    out = compress_image(src, min_bytes=min_kb * 1024)
+    assert b"Exif\x00\x00" not in out
+    assert not open_exif(out)
+    with Image.open(io.BytesIO(out)) as img:
+        assert img.size == (64, 32)
+
+
+def test_strip_keeps_pixels_and_icc_profile():
+    icc = b"\x00" * 128
+    src = make_jpeg(icc=icc)
+    out = strip_jpeg_metadata(src)
+    assert out is not None and len(out) < len(src)
+    with Image.open(io.BytesIO(src)) as a, Image.open(io.BytesIO(out)) as b:
+        assert a.tobytes() == b.tobytes()
+        assert b.info.get("icc_profile") == icc
+
+
+def test_rotated_small_jpeg_is_transposed_before_exif_is_dropped():
+    # Orientation=6：需顺时针旋转 90°，去掉 EXIF 前必须先摆正
+    out = compress_image(make_jpeg(orientation=6))
+    assert not open_exif(out)
+    with Image.open(io.BytesIO(out)) as img:
+        assert img.size == (32, 64)
+
+
+def test_strip_rejects_non_jpeg():
+    assert strip_jpeg_metadata(b"\x89PNG\r\n\x1a\n") is None
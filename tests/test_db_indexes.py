@@ -0,0 +1,45 @@
+import sqlite3
+
+import pytest
+
+from core.db import PostDB
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute(PostDB._POSTS_SCHEMA)
+    for statements in PostDB._MIGRATIONS:
+        for statement in statements:
+            conn.execute(statement)
+    yield conn
+    conn.close()
+
+
+def query_plan(conn: sqlite3.Connection, query: str, params: tuple) -> str:
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+    return "\n".join(row[-1] for row in rows)
+
+
+@pytest.mark.parametrize(
+    ("where", "params", "index"),
+    [
+        ("status = ?", ("pending",), "idx_posts_status_id"),
+        ("uin = ?", (10001,), "idx_posts_uin_time"),
+        ("gin = ? AND status = ?", (20002, "approved"), "idx_posts_gin_status"),
+    ],
+)
+def test_lookup_uses_index(conn, where, params, index):
+    query = f"SELECT {PostDB._POST_COLUMNS} FROM posts WHERE {where} LIMIT 1"
+    plan = query_plan(conn, query, params)
+    assert f"USING INDEX {index}" in plan, plan
+
+
+def test_status_lookup_ordered_by_id_avoids_sort(conn):
+    query = (
+        f"SELECT {PostDB._POST_COLUMNS} FROM posts "
+        "WHERE status = ? ORDER BY id DESC LIMIT 20"
+    )
+    plan = query_plan(conn, query, ("approved",))
+    assert "USING INDEX idx_posts_status_id" in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
@@ -0,0 +1,78 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from core.db import PostDB
+from core.model import Comment, Post
+
+
+def make_posts(n: int) -> list[Post]:
+    return [
+        Post(
+            tid=f"tid{i}",
+            uin=10000 + i,
+            name=f"用户{i}",
+            text=f"第 {i} 条说说",
+            status="approved",
+            create_time=1767225600 + i,
+            comments=[
+                Comment(uin=20000, nickname="评论者", content="好", create_time=1)
+            ],
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def db(tmp_path):
+    return PostDB(SimpleNamespace(db_path=tmp_path / "posts.db"))
+
+
+async def sequence(db: PostDB) -> int:
+    async with db.pool.reader() as conn:
+        async with conn.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'posts'"
+        ) as cursor:
+            row = await cursor.fetchone()
+    return row[0] if row else 0
+
+
+def test_resave_keeps_sequence(db):
+    async def run():
+        await db.initialize()
+        try:
+            ids = await db.save_many(make_posts(20))
+            seq = await sequence(db)
+            for _ in range(5):
+                assert await db.save_many(make_posts(20)) == ids
+            assert await sequence(db) == seq
+            new_id = await db.save(Post(uin=1, name="投稿", text="新稿件"))
+            assert new_id == seq + 1
+        finally:
+            await db.close()
+
+    asyncio.run(run())
+
+
+def test_save_updates_by_tid_then_id(db):
+    async def run():
+        await db.initialize()
+        try:
+            post_id = await db.save(Post(tid="t1", uin=1, name="a", text="v1"))
+            await db.save(Post(tid="t1", uin=1, name="b", text="v2"))
+            await db.save(Post(id=post_id, tid="t2", uin=1, name="c", text="v3"))
+            # 同一批里重复的 tid 只插入一次
+            ids = await db.save_many(
+                [Post(tid="t3", uin=2, text="x"), Post(tid="t3", uin=2, text="y")]
+            )
+            saved = await db.get(post_id)
+            assert saved is not None
+            assert (saved.tid, saved.name, saved.text) == ("t2", "c", "v3")
+            assert len(saved.comments) == 0
+            assert ids[0] == ids[1]
+            assert (await db.get("t3", key="tid")).text == "y"
+        finally:
+            await db.close()
+
+    asyncio.run(run())
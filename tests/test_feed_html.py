@@ -0,0 +1,43 @@
+import json
+from dataclasses import asdict
+from pathlib import Path
+
+import pytest
+
+from core.qzone.feed_html import (
+    Bs4FeedExtractor,
+    FeedHtml,
+    LxmlFeedExtractor,
+    lxml_html,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures" / "feeds3"
+CASES = sorted(p.stem for p in FIXTURES.glob("*.html"))
+
+
+def dump(out: FeedHtml) -> dict:
+    data = asdict(out)
+    data["comments"] = [comment.model_dump() for comment in out.comments]
+    return data
+
+
+def load_case(name: str) -> tuple[str, dict]:
+    html = (FIXTURES / f"{name}.html").read_text(encoding="utf-8")
+    golden = json.loads((FIXTURES / f"{name}.json").read_text(encoding="utf-8"))
+    return html, golden
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_bs4_matches_golden(name):
+    html, golden = load_case(name)
+    assert dump(Bs4FeedExtractor().extract(html)) == golden
+
+
+@pytest.mark.skipif(lxml_html is None, reason="lxml 未安装")
+@pytest.mark.parametrize("name", CASES)
+def test_lxml_matches_bs4(name):
+    html, golden = load_case(name)
+    bs4_out = Bs4FeedExtractor().extract(html)
+    lxml_out = LxmlFeedExtractor().extract(html)
+    assert lxml_out == bs4_out
+    assert dump(lxml_out) == golden
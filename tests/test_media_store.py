@@ -0,0 +1,81 @@
+import asyncio
+import io
+import traceback
+
+import pytest
+from quart import Quart, request
+from quart.testing.utils import make_test_body_with_headers
+from werkzeug.datastructures import FileStorage
+
+from core.media_store import MediaStore, MediaTooLargeError
+
+
+def make_app(store: MediaStore, seen: dict) -> Quart:
+    app = Quart(__name__)
+
+    @app.post("/upload")
+    async def upload():
+        try:
+            media_id, upload, size = await store.receive(request, ("file",))
+        except MediaTooLargeError as e:
+            seen["error"] = e
+            return {"ok": False}, 400
+        return {"id": media_id, "name": upload.filename, "size": size}
+
+    return app
+
+
+def post(app: Quart, data: bytes):
+    async def run():
+        file = FileStorage(io.BytesIO(data), filename="a.jpg", name="file")
+        # 与浏览器一样带上 Content-Length
+        body, headers = make_test_body_with_headers(files={"file": file})
+        headers["Content-Length"] = str(len(body))
+        resp = await app.test_client().post("/upload", data=body, headers=headers)
+        return resp.status_code, await resp.get_json()
+
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = MediaStore(tmp_path, max_bytes=100 * 1024)
+    allocate = store.allocate
+    store.allocated = 0
+
+    def counting_allocate():
+        store.allocated += 1
+        return allocate()
+
+    store.allocate = counting_allocate
+    return store
+
+
+def test_receive_stages_file(store):
+    data = b"x" * 5000
+    status, body = post(make_app(store, {}), data)
+    assert status == 200
+    assert body["size"] == len(data)
+    assert asyncio.run(store.read(body["id"])) == data
+    assert len(list(store.root.glob("*.bin"))) == 1
+
+
+def test_receive_aborts_while_streaming(store):
+    # 请求体在 Content-Length 余量内，只能在写入时发现超限
+    seen: dict = {}
+    status, _ = post(make_app(store, seen), b"x" * (store.max_bytes + 1024))
+    assert status == 400
+    assert isinstance(seen["error"], MediaTooLargeError)
+    frames = traceback.extract_tb(seen["error"].__traceback__)
+    assert frames[-1].name == "write"
+    assert store.allocated == 1
+    assert not list(store.root.glob("*.bin"))
+
+
+def test_receive_rejects_by_content_length(store):
+    seen: dict = {}
+    status, _ = post(make_app(store, seen), b"x" * (store.max_bytes * 2))
+    assert status == 400
+    assert isinstance(seen["error"], MediaTooLargeError)
+    assert store.allocated == 0
+    assert not list(store.root.glob("*.bin"))
@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+from core.qzone.parse_pool import FeedParsePool
+from core.service import PostService
+
+
+def make_msglist() -> list[dict]:
+    msglist = [
+        {
+            "tid": f"tid{i}",
+            "uin": 10000 + i,
+            "name": f"用户{i}",
+            "content": f"第 {i} 条说说",
+            "created_time": 1767225600 + i,
+            "pic": [{"url2": f"https://a.qpic.cn/{i}.jpg"}],
+            "commentlist": [
+                {"uin": 20000, "name": "评论者", "content": "好", "create_time": 1}
+            ],
+        }
+        for i in range(5)
+    ]
+    # rt_con 不是对象，parse_feed_item 会抛异常
+    msglist[2]["rt_con"] = "broken"
+    return msglist
+
+
+def parse(workers: int, msglist: list[dict]) -> list:
+    service = PostService.__new__(PostService)
+    service.parse_pool = FeedParsePool(workers) if workers > 0 else None
+    try:
+        return asyncio.run(service._parse_feeds(msglist))
+    finally:
+        service.close()
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_inline_and_pool_skip_the_same_bad_item(workers):
+    msglist = make_msglist()
+    inline = parse(0, msglist)
+    pooled = parse(workers, msglist)
+    assert [p.tid for p in inline] == ["tid0", "tid1", "tid3", "tid4"]
+    assert [p.model_dump() for p in pooled] == [p.model_dump() for p in inline]
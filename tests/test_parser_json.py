@@ -0,0 +1,33 @@
+import pytest
+
+from core.qzone.parser import QzoneParser
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        (
+            '{"code":0,"msg":"callback","data":{}}',
+            {"code": 0, "msg": "callback", "data": {}},
+        ),
+        (
+            '{"code":0,"callbackUrl":"https://x/y"}',
+            {"code": 0, "callbackUrl": "https://x/y"},
+        ),
+        ('_Callback({"code":0,"data":{"a":1}});', {"code": 0, "data": {"a": 1}}),
+        (
+            '<script>frameElement.callback({"ret":0,"msg":"}"});</script>',
+            {"ret": 0, "msg": "}"},
+        ),
+        ('  \n{"code":0}\n', {"code": 0}),
+        ("callback({code:0,data:undefined})", {"code": 0, "data": None}),
+    ],
+)
+def test_parse_response_unwraps_jsonp_only(text, expected):
+    assert QzoneParser.parse_response(text) == expected
+
+
+def test_parse_response_without_json():
+    data = QzoneParser.parse_response("<html>502 Bad Gateway</html>")
+    assert data["data"] == {}
+    assert data["code"] != 0